@@ -24,6 +24,33 @@ DEBUG_SAVE_INTERMEDIATE = True
 # Usage: Set environment variable DEBUG_SAVE_FILES=True to enable
 DEBUG_SAVE_FILES = os.environ.get("DEBUG_SAVE_FILES", "False").lower() in ("true", "1", "yes")
 
+# PaddleOCR Inference
+# TensorRT is only used when requested AND Paddle was built with CUDA
+# Usage: Set environment variable PADDLE_USE_TENSORRT=True to enable
+PADDLE_USE_TENSORRT = os.environ.get("PADDLE_USE_TENSORRT", "False").lower() in ("true", "1", "yes")
+PADDLE_MAX_CPU_THREADS = 8
+
+# PaddleOCR on the GPU, in a dedicated worker process that keeps the model loaded
+# (engines/paddle/gpu_worker.py). Falls back to CPU if the worker can't start.
+# Usage: Set environment variable RECEIPT_OCR_USE_GPU=True to enable
+RECEIPT_OCR_USE_GPU = os.environ.get("RECEIPT_OCR_USE_GPU", "False").lower() in ("true", "1", "yes")
+PADDLE_GPU_MEM_FRACTION = float(os.environ.get("PADDLE_GPU_MEM_FRACTION", "0.5"))
+
+# OCR Micro-Batching
+# Concurrent requests share batched PaddleOCR predict calls (engines/paddle/ocr_batcher.py)
+# Usage: Set environment variable OCR_MICRO_BATCHING=True to enable
+OCR_MICRO_BATCHING = os.environ.get("OCR_MICRO_BATCHING", "False").lower() in ("true", "1", "yes")
+OCR_MAX_BATCH_SIZE = 8
+OCR_MAX_BATCH_WAIT = 0.05  # seconds
+
+# OCR Backend
+# "paddle" (default) runs PaddleOCR; "onnx" runs exported PP-OCR det/rec models
+# with ONNX Runtime (requires onnxruntime and the files in ONNX_MODEL_DIR:
+# det.onnx, rec.onnx, rec_dict.txt)
+# Usage: Set environment variable RECEIPT_OCR_BACKEND=onnx to enable
+RECEIPT_OCR_BACKEND = os.environ.get("RECEIPT_OCR_BACKEND", "paddle").lower()
+ONNX_MODEL_DIR = os.environ.get("ONNX_MODEL_DIR", "onnx_models")
+
 # Receipt Parsing
 RECEIPT_MIN_ITEMS = 1
 RECEIPT_MAX_ITEMS = 100
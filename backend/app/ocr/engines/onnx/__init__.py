@@ -0,0 +1,20 @@
+"""
+ONNX Runtime OCR Engine
+=======================
+PP-OCR detection + recognition models exported to ONNX, run with ONNX Runtime.
+
+Module Structure:
+- onnx_engine.py: Engine wrapper returning PaddleOCR 3.x style results
+
+The engine is a drop-in for PaddleOCREngine: engines/paddle/paddle_coordinator.py
+text extraction works on its results unchanged. Selected with
+RECEIPT_OCR_BACKEND=onnx (see app/core/constants.py).
+"""
+
+from .onnx_engine import ONNX_AVAILABLE, OnnxOCREngine, get_onnx_engine
+
+__all__ = [
+    'OnnxOCREngine',
+    'get_onnx_engine',
+    'ONNX_AVAILABLE',
+]
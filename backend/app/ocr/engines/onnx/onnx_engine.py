@@ -0,0 +1,292 @@
+"""
+ONNX Runtime OCR Engine Core
+============================
+Runs PP-OCR text detection (DB) and recognition (CTC) models exported to ONNX.
+
+Pre- and post-processing follow PaddleOCR's defaults (DetResizeForTest with
+limit_type=max, DBPostProcess with quad boxes, CTCLabelDecode), and results use
+the PaddleOCR 3.x format ({'rec_texts', 'rec_scores', 'rec_boxes'}) so the
+existing text merging and correction code can consume them.
+
+Unlike the Paddle predictor, ONNX Runtime sessions keep a flat memory
+footprint in long-running services and are safe to call from several threads.
+"""
+
+import logging
+import math
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from app.core.constants import ONNX_MODEL_DIR, PADDLE_MAX_CPU_THREADS
+
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ort = None
+    ONNX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Global singleton instance
+_onnx_engine = None
+_onnx_engine_lock = threading.Lock()
+
+# Detection: PaddleOCR DetResizeForTest / NormalizeImage defaults
+DET_LIMIT_SIDE_LEN = 960
+DET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+DET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+# Detection: PaddleOCR DBPostProcess defaults
+DB_THRESH = 0.3
+DB_BOX_THRESH = 0.6
+DB_UNCLIP_RATIO = 1.5
+DB_MAX_CANDIDATES = 1000
+DB_MIN_SIZE = 3
+
+# Recognition: input height, base width and batch size of the PP-OCR rec model
+REC_IMAGE_HEIGHT = 48
+REC_IMAGE_WIDTH = 320
+REC_BATCH_NUM = 6
+
+
+def _create_session(model_path: str, num_threads: int):
+    """Create a CPU InferenceSession with full graph optimization"""
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"ONNX model not found: {model_path}")
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = num_threads
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def _load_character_dict(dict_path: str) -> List[str]:
+    """CTC label list: blank, dictionary characters, then space"""
+    if not os.path.exists(dict_path):
+        raise FileNotFoundError(f"Recognition dictionary not found: {dict_path}")
+    with open(dict_path, "r", encoding="utf-8") as f:
+        characters = [line.rstrip("\r\n") for line in f]
+    return ["blank"] + characters + [" "]
+
+
+def _order_box(points: np.ndarray) -> np.ndarray:
+    """Order 4 box corners as top-left, top-right, bottom-right, bottom-left"""
+    points = points[np.argsort(points[:, 0])]
+    left = points[:2][np.argsort(points[:2, 1])]
+    right = points[2:][np.argsort(points[2:, 1])]
+    return np.array([left[0], right[0], right[1], left[1]], dtype=np.float32)
+
+
+def _box_score(pred: np.ndarray, box: np.ndarray) -> float:
+    """Mean probability inside the box (DBPostProcess.box_score_fast)"""
+    h, w = pred.shape
+    xmin = int(np.clip(np.floor(box[:, 0].min()), 0, w - 1))
+    xmax = int(np.clip(np.ceil(box[:, 0].max()), 0, w - 1))
+    ymin = int(np.clip(np.floor(box[:, 1].min()), 0, h - 1))
+    ymax = int(np.clip(np.ceil(box[:, 1].max()), 0, h - 1))
+
+    mask = np.zeros((ymax - ymin + 1, xmax - xmin + 1), dtype=np.uint8)
+    shifted = box - np.array([xmin, ymin], dtype=np.float32)
+    cv2.fillPoly(mask, [shifted.astype(np.int32)], 1)
+    return cv2.mean(pred[ymin:ymax + 1, xmin:xmax + 1], mask)[0]
+
+
+def _crop_text_region(image: np.ndarray, box: np.ndarray) -> np.ndarray:
+    """Perspective-crop a text box; tall crops are rotated to horizontal"""
+    width = int(max(np.linalg.norm(box[0] - box[1]), np.linalg.norm(box[2] - box[3])))
+    height = int(max(np.linalg.norm(box[0] - box[3]), np.linalg.norm(box[1] - box[2])))
+    width, height = max(width, 1), max(height, 1)
+    target = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=np.float32)
+    matrix = cv2.getPerspectiveTransform(box, target)
+    crop = cv2.warpPerspective(image, matrix, (width, height),
+                               borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC)
+    if height / width >= 1.5:
+        crop = np.rot90(crop)
+    return crop
+
+
+class OnnxPPOCR:
+    """PP-OCR det + rec on ONNX Runtime with the PaddleOCR ocr()/predict() interface"""
+
+    def __init__(self, model_dir: str, num_threads: int):
+        """
+        Load the ONNX models.
+
+        Args:
+            model_dir (str): Directory with det.onnx, rec.onnx and rec_dict.txt
+            num_threads (int): Intra-op threads per session
+        """
+        self.det_session = _create_session(os.path.join(model_dir, "det.onnx"), num_threads)
+        self.rec_session = _create_session(os.path.join(model_dir, "rec.onnx"), num_threads)
+        self.det_input = self.det_session.get_inputs()[0].name
+        self.rec_input = self.rec_session.get_inputs()[0].name
+        self.characters = _load_character_dict(os.path.join(model_dir, "rec_dict.txt"))
+
+    def ocr(self, images: Any) -> List[Dict[str, Any]]:
+        """
+        Run OCR on one image or a list of images.
+
+        Returns:
+            One result dict per image with 'rec_texts', 'rec_scores' and
+            'rec_boxes' ([x1, y1, x2, y2] per text box)
+        """
+        if isinstance(images, (list, tuple)):
+            return [self._run_single(image) for image in images]
+        return [self._run_single(images)]
+
+    predict = ocr
+
+    def _run_single(self, image: np.ndarray) -> Dict[str, Any]:
+        """Detection followed by recognition of every detected box"""
+        if len(image.shape) == 2 or image.shape[2] == 1:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+        boxes = self._detect(image)
+        # Reading order: top to bottom, then left to right
+        boxes.sort(key=lambda box: (box[0][1], box[0][0]))
+
+        crops = [_crop_text_region(image, box) for box in boxes]
+        texts, scores = self._recognize(crops)
+
+        rec_boxes = np.array(
+            [[box[:, 0].min(), box[:, 1].min(), box[:, 0].max(), box[:, 1].max()] for box in boxes],
+            dtype=np.int32
+        ).reshape(-1, 4)
+        return {
+            "rec_texts": texts,
+            "rec_scores": scores,
+            "rec_boxes": rec_boxes,
+            "rec_polys": boxes,
+        }
+
+    def _detect(self, image: np.ndarray) -> List[np.ndarray]:
+        """DB text detection; returns ordered 4-point boxes in image coordinates"""
+        height, width = image.shape[:2]
+
+        # Limit the longer side, then round both sides to multiples of 32
+        ratio = min(1.0, DET_LIMIT_SIDE_LEN / max(height, width))
+        resize_h = max(int(round(height * ratio / 32) * 32), 32)
+        resize_w = max(int(round(width * ratio / 32) * 32), 32)
+        resized = cv2.resize(image, (resize_w, resize_h))
+
+        blob = (resized.astype(np.float32) / 255.0 - DET_MEAN) / DET_STD
+        blob = blob.transpose(2, 0, 1)[np.newaxis]
+        pred = self.det_session.run(None, {self.det_input: blob})[0][0, 0]
+
+        bitmap = (pred > DB_THRESH).astype(np.uint8)
+        contours, _ = cv2.findContours(bitmap, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+        scale = np.array([width / pred.shape[1], height / pred.shape[0]], dtype=np.float32)
+        boxes = []
+        for contour in contours[:DB_MAX_CANDIDATES]:
+            center, (box_w, box_h), angle = cv2.minAreaRect(contour)
+            if min(box_w, box_h) < DB_MIN_SIZE:
+                continue
+            if _box_score(pred, cv2.boxPoints((center, (box_w, box_h), angle))) < DB_BOX_THRESH:
+                continue
+
+            # Unclip: offsetting a rectangle outwards by d and taking the min-area
+            # rectangle again grows each side by 2d (same as pyclipper + minAreaRect)
+            distance = (box_w * box_h) * DB_UNCLIP_RATIO / (2 * (box_w + box_h))
+            box_w, box_h = box_w + 2 * distance, box_h + 2 * distance
+            if min(box_w, box_h) < DB_MIN_SIZE + 2:
+                continue
+
+            box = _order_box(cv2.boxPoints((center, (box_w, box_h), angle))) * scale
+            box[:, 0] = np.clip(np.round(box[:, 0]), 0, width - 1)
+            box[:, 1] = np.clip(np.round(box[:, 1]), 0, height - 1)
+            boxes.append(box)
+
+        return boxes
+
+    def _recognize(self, crops: List[np.ndarray]):
+        """CTC recognition of text crops, batched by aspect ratio"""
+        texts = [""] * len(crops)
+        scores = [0.0] * len(crops)
+
+        # Similar widths in a batch keep padding small
+        order = sorted(range(len(crops)), key=lambda i: crops[i].shape[1] / crops[i].shape[0])
+        for start in range(0, len(order), REC_BATCH_NUM):
+            batch_indices = order[start:start + REC_BATCH_NUM]
+            max_ratio = max([REC_IMAGE_WIDTH / REC_IMAGE_HEIGHT] +
+                            [crops[i].shape[1] / crops[i].shape[0] for i in batch_indices])
+            batch_width = int(REC_IMAGE_HEIGHT * max_ratio)
+
+            blob = np.zeros((len(batch_indices), 3, REC_IMAGE_HEIGHT, batch_width), dtype=np.float32)
+            for row, i in enumerate(batch_indices):
+                crop = crops[i]
+                resized_w = min(batch_width, int(math.ceil(REC_IMAGE_HEIGHT * crop.shape[1] / crop.shape[0])))
+                resized = cv2.resize(crop, (resized_w, REC_IMAGE_HEIGHT)).astype(np.float32)
+                blob[row, :, :, :resized_w] = ((resized / 255.0 - 0.5) / 0.5).transpose(2, 0, 1)
+
+            preds = self.rec_session.run(None, {self.rec_input: blob})[0]
+            for row, i in enumerate(batch_indices):
+                texts[i], scores[i] = self._ctc_decode(preds[row])
+
+        return texts, scores
+
+    def _ctc_decode(self, pred: np.ndarray):
+        """Greedy CTC decoding: drop repeats and blanks"""
+        indices = pred.argmax(axis=1)
+        probs = pred.max(axis=1)
+        keep = np.ones(len(indices), dtype=bool)
+        keep[1:] = indices[1:] != indices[:-1]
+        keep &= indices != 0
+
+        text = "".join(self.characters[i] for i in indices[keep] if i < len(self.characters))
+        score = float(probs[keep].mean()) if keep.any() else 0.0
+        return text, score
+
+
+class OnnxOCREngine:
+    """ONNX Runtime OCR engine wrapper, interchangeable with PaddleOCREngine"""
+
+    def __init__(self, model_dir: Optional[str] = None, num_threads: Optional[int] = None):
+        """
+        Initialize the ONNX Runtime predictor.
+
+        Args:
+            model_dir (str): Directory with det.onnx, rec.onnx and rec_dict.txt
+                             - defaults to ONNX_MODEL_DIR
+            num_threads (int): Intra-op threads per session - defaults to
+                             min(cpu_count, PADDLE_MAX_CPU_THREADS)
+
+        Raises:
+            ImportError: onnxruntime is not installed
+            FileNotFoundError: A model or the dictionary is missing
+        """
+        if not ONNX_AVAILABLE:
+            raise ImportError("onnxruntime is not installed")
+
+        model_dir = model_dir or ONNX_MODEL_DIR
+        if num_threads is None:
+            num_threads = min(os.cpu_count() or 1, PADDLE_MAX_CPU_THREADS)
+
+        self.lang = "onnx"
+        # Same attribute as PaddleOCREngine.ocr, so ocr_engine.ocr.ocr(image) works
+        self.ocr = OnnxPPOCR(model_dir, num_threads)
+        logger.info(f"ONNX OCR engine initialized from {model_dir} ({num_threads} threads)")
+
+
+def get_onnx_engine(model_dir: Optional[str] = None) -> OnnxOCREngine:
+    """
+    Get singleton ONNX OCR engine instance
+
+    Sessions are thread-safe, so one engine serves all worker threads.
+
+    Args:
+        model_dir (str): Model directory (used on first call only)
+
+    Returns:
+        OnnxOCREngine: Singleton engine instance
+    """
+    global _onnx_engine
+    if _onnx_engine is None:
+        with _onnx_engine_lock:
+            if _onnx_engine is None:
+                _onnx_engine = OnnxOCREngine(model_dir=model_dir)
+    return _onnx_engine
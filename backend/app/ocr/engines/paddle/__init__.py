@@ -5,7 +5,9 @@ Modular PaddleOCR engine with specialized components.
 
 Module Structure:
 - paddle_engine.py: Core PaddleOCR wrapper
+- gpu_worker.py: PaddleOCR on the GPU in a dedicated worker process
 - ocr_execution.py: OCR execution and result processing
+- ocr_batcher.py: Micro-batching of predict calls across concurrent requests
 - text_merging.py: Text box spatial analysis and merging
 - text_correction.py: Croatian text correction
 - simplified_preprocessing.py: CLAHE-only preprocessing
@@ -0,0 +1,216 @@
+"""
+PaddleOCR GPU Worker Process
+============================
+Runs a single GPU PaddleOCR engine in a dedicated process and serves OCR
+requests from the API process.
+
+The model is loaded once when the worker starts and stays warm for every
+request. Requests from all threads are serialized on the one GPU predictor,
+which sidesteps PaddlePaddle's thread-safety limits. Images go to the worker
+through shared memory, and only the result fields that text extraction
+uses (rec_texts, rec_scores, rec_boxes) are sent back.
+
+Selected with RECEIPT_OCR_USE_GPU=True (see app/core/constants.py).
+"""
+
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.constants import PADDLE_GPU_MEM_FRACTION
+
+from .paddle_engine import PaddleOCREngine, gpu_engine_opts
+
+logger = logging.getLogger(__name__)
+
+# Result fields copied back from the worker (everything paddle_coordinator reads)
+_RESULT_KEYS = ("rec_texts", "rec_scores", "rec_boxes")
+
+# Seconds to wait for the worker to load the model / answer one request
+GPU_WORKER_START_TIMEOUT = 600
+GPU_WORKER_REQUEST_TIMEOUT = 120
+
+# Shared GPU engine (one worker process per API process)
+_gpu_engine = None
+_gpu_engine_lock = threading.Lock()
+
+
+def _read_shared_image(spec) -> np.ndarray:
+    """Copy an image out of the shared memory block described by spec"""
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf).copy()
+    finally:
+        block.close()
+
+
+def _plain_result(result) -> Optional[Dict[str, Any]]:
+    """Picklable copy of the fields text extraction needs from an OCRResult"""
+    if result is None:
+        return None
+    return {key: result[key] for key in _RESULT_KEYS if key in result}
+
+
+def _worker_main(requests, responses, lang, engine_opts, mem_fraction):
+    """Worker process loop: load the engine once, then answer requests until None"""
+    try:
+        try:
+            import paddle
+            paddle.set_flags({"FLAGS_fraction_of_gpu_memory_to_use": mem_fraction})
+        except Exception as e:
+            logger.warning(f"[GPU WORKER] Could not set GPU memory fraction: {e}")
+        engine = PaddleOCREngine(lang=lang, engine_opts=engine_opts)
+    except Exception as e:
+        responses.put((None, "error", f"{type(e).__name__}: {e}"))
+        return
+    responses.put((None, "ready", None))
+
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        request_id, specs = request
+        try:
+            images = [_read_shared_image(spec) for spec in specs]
+            results = engine.ocr.ocr(images)
+            responses.put((request_id, "ok", [_plain_result(result) for result in results]))
+        except Exception as e:
+            responses.put((request_id, "error", f"{type(e).__name__}: {e}"))
+
+
+class GpuOCRWorker:
+    """PaddleOCR ocr()/predict() interface served by a GPU worker process"""
+
+    def __init__(self, lang: str, engine_opts: Dict[str, Any],
+                 mem_fraction: float = PADDLE_GPU_MEM_FRACTION,
+                 timeout: float = GPU_WORKER_REQUEST_TIMEOUT):
+        """
+        Start the worker process and wait until its model is loaded.
+
+        Args:
+            lang (str): Language code for the engine
+            engine_opts (dict): PaddleOCR options for the engine (see gpu_engine_opts)
+            mem_fraction (float): Share of GPU memory Paddle may reserve
+            timeout (float): Seconds to wait for each OCR request
+
+        Raises:
+            RuntimeError: If the worker fails to load the engine
+        """
+        # CUDA can't be initialized in a forked child, so always spawn
+        context = multiprocessing.get_context("spawn")
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self._process = context.Process(
+            target=_worker_main,
+            args=(self._requests, self._responses, lang, engine_opts, mem_fraction),
+            name="ocr-gpu-worker",
+            daemon=True,
+        )
+        self._process.start()
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count()
+        self.timeout = timeout
+
+        try:
+            _, status, error = self._responses.get(timeout=GPU_WORKER_START_TIMEOUT)
+        except queue.Empty:
+            status, error = "error", "timed out loading the model"
+        if status != "ready":
+            self.close()
+            raise RuntimeError(f"GPU OCR worker failed to start: {error}")
+        logger.info(f"GPU OCR worker started (pid={self._process.pid})")
+
+    def ocr(self, images: Any) -> List[Optional[Dict[str, Any]]]:
+        """
+        Run OCR on one image or a list of images in the worker.
+
+        Returns:
+            One result dict per image with 'rec_texts', 'rec_scores' and 'rec_boxes'
+        """
+        batch = list(images) if isinstance(images, (list, tuple)) else [images]
+        blocks = []
+        try:
+            specs = []
+            for image in batch:
+                image = np.ascontiguousarray(image)
+                block = shared_memory.SharedMemory(create=True, size=max(image.nbytes, 1))
+                blocks.append(block)
+                np.ndarray(image.shape, dtype=image.dtype, buffer=block.buf)[...] = image
+                specs.append((block.name, image.shape, image.dtype.str))
+
+            # One request in flight at a time: the worker runs a single predictor
+            with self._lock:
+                request_id = next(self._request_ids)
+                self._requests.put((request_id, specs))
+                while True:
+                    try:
+                        response_id, status, payload = self._responses.get(timeout=self.timeout)
+                    except queue.Empty:
+                        raise RuntimeError(
+                            f"GPU OCR worker did not answer within {self.timeout}s "
+                            f"(alive={self._process.is_alive()})"
+                        )
+                    # Late answers to requests that timed out are dropped
+                    if response_id == request_id:
+                        break
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        if status != "ok":
+            raise RuntimeError(f"GPU OCR worker error: {payload}")
+        return payload
+
+    predict = ocr
+
+    def close(self):
+        """Stop the worker process"""
+        if self._process.is_alive():
+            self._requests.put(None)
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+
+
+class GpuOCREngine:
+    """PaddleOCR on the GPU in a worker process - drop-in for PaddleOCREngine"""
+
+    def __init__(self, lang: str = "hr", engine_opts: Optional[Dict[str, Any]] = None):
+        """
+        Start the GPU worker.
+
+        Args:
+            lang (str): Language code - defaults to 'hr' for Croatian
+            engine_opts (dict): PaddleOCR options - defaults to gpu_engine_opts()
+        """
+        self.lang = lang
+        self.ocr = GpuOCRWorker(lang, engine_opts if engine_opts is not None else gpu_engine_opts())
+
+
+def get_gpu_ocr_engine(lang: str = "hr", engine_opts: Optional[Dict[str, Any]] = None) -> GpuOCREngine:
+    """
+    Get singleton GPU OCR engine instance
+
+    The worker serializes requests itself, so one engine serves all threads.
+
+    Args:
+        lang (str): Language code (used on first call only)
+        engine_opts (dict): PaddleOCR options (used on first call only)
+
+    Returns:
+        GpuOCREngine: Singleton engine instance
+    """
+    global _gpu_engine
+    if _gpu_engine is None:
+        with _gpu_engine_lock:
+            if _gpu_engine is None:
+                _gpu_engine = GpuOCREngine(lang=lang, engine_opts=engine_opts)
+    return _gpu_engine
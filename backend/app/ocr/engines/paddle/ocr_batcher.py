@@ -0,0 +1,164 @@
+"""
+OCR Micro-Batching
+==================
+Combines predict() calls from concurrent requests into batched PaddleOCR calls.
+
+API requests run OCR from executor threads, so N parallel uploads would
+otherwise make N separate predict calls on the shared engine. OCRBatcher
+queues the images and a single worker thread runs them in batches of up to
+max_batch_size. The worker waits up to max_wait_time for more images, but
+only while other requests are in flight, so a lone request adds no latency.
+Each batch is split by image size (rounded to SIZE_BUCKET px) so one predict
+call sees similarly sized inputs.
+
+Batched calls from one batcher never overlap, but the engine is not
+exclusive to it: other callers of the same engine (e.g. the ProcessingCoordinator
+path in paddle_coordinator) still call it directly.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from app.core.constants import OCR_MAX_BATCH_SIZE, OCR_MAX_BATCH_WAIT
+
+logger = logging.getLogger(__name__)
+
+# Images whose sides round to the same multiple of this share a predict call
+SIZE_BUCKET = 64
+
+# Shared batchers, one per engine (keyed by id; the batcher keeps the engine alive)
+_batchers: Dict[int, "OCRBatcher"] = {}
+_batchers_lock = threading.Lock()
+
+
+def _size_bucket(image: np.ndarray) -> Tuple[int, int]:
+    """Size group of an image for batching"""
+    return round(image.shape[0] / SIZE_BUCKET), round(image.shape[1] / SIZE_BUCKET)
+
+
+class OCRBatcher:
+    """Runs predict() for many threads as batched calls on one engine"""
+
+    def __init__(self, ocr_engine, max_batch_size: int = OCR_MAX_BATCH_SIZE,
+                 max_wait_time: float = OCR_MAX_BATCH_WAIT):
+        """
+        Args:
+            ocr_engine: Engine whose ocr.predict() runs the batches (see get_ocr_engine)
+            max_batch_size: Most images per predict call
+            max_wait_time: Seconds to wait for images from other in-flight requests
+        """
+        self.ocr_engine = ocr_engine
+        self.max_batch_size = max_batch_size
+        self.max_wait_time = max_wait_time
+        self._queue: "queue.Queue[Tuple[np.ndarray, Future]]" = queue.Queue()
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        threading.Thread(target=self._process_loop, name=f"ocr-batcher-{getattr(ocr_engine, 'lang', 'ocr')}", daemon=True).start()
+
+    def predict(self, image: np.ndarray) -> List[Any]:
+        """
+        Run OCR on one image (blocks until its batch has run).
+
+        Returns:
+            The engine's predict() result for the image: a one-element list,
+            as from ocr.predict(image)
+        """
+        future: Future = Future()
+        with self._in_flight_lock:
+            self._in_flight += 1
+        try:
+            self._queue.put((image, future))
+            return [future.result()]
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+
+    def _collect_batch(self) -> List[Tuple[np.ndarray, Future]]:
+        """Block for the next image, then gather more while others are in flight"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_time
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            # Only wait for requests that are already running
+            remaining = deadline - time.monotonic()
+            with self._in_flight_lock:
+                in_flight = self._in_flight
+            if in_flight <= len(batch) or remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _process_loop(self):
+        """Worker thread: run queued images in size-grouped batches"""
+        while True:
+            batch = []
+            try:
+                batch = self._collect_batch()
+                groups: Dict[Tuple[int, int], List[Tuple[np.ndarray, Future]]] = {}
+                for item in batch:
+                    groups.setdefault(_size_bucket(item[0]), []).append(item)
+                for items in groups.values():
+                    self._run_group(items)
+            except Exception as e:
+                # Keep the worker alive: fail this batch's waiting requests instead
+                logger.exception("[OCR BATCHER] Batch processing failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _run_group(self, items: List[Tuple[np.ndarray, Future]]):
+        """One predict call for a group of images; results go to their futures"""
+        try:
+            results = self.ocr_engine.ocr.predict([image for image, _ in items])
+            if results is None or len(results) != len(items):
+                raise ValueError(
+                    f"expected {len(items)} results, got {len(results) if results is not None else 0}"
+                )
+        except Exception as e:
+            if len(items) > 1:
+                # Retry one by one so a single bad image doesn't fail the others
+                logger.warning(f"[OCR BATCHER] Batched predict failed ({e}), running images one by one")
+                for item in items:
+                    self._run_group([item])
+                return
+            items[0][1].set_exception(e)
+            return
+
+        if len(items) > 1:
+            logger.debug(f"[OCR BATCHER] Ran {len(items)} images in one predict call")
+        for (_, future), result in zip(items, results, strict=True):
+            future.set_result(result)
+
+
+def get_ocr_batcher(ocr_engine) -> OCRBatcher:
+    """
+    Get the shared OCR batcher for an engine
+
+    Args:
+        ocr_engine: Engine the batched predict calls run on (see get_ocr_engine)
+
+    Returns:
+        OCRBatcher: Singleton batcher instance for ocr_engine
+    """
+    key = id(ocr_engine)
+    batcher = _batchers.get(key)
+    if batcher is None:
+        with _batchers_lock:
+            batcher = _batchers.get(key)
+            if batcher is None:
+                batcher = OCRBatcher(ocr_engine)
+                _batchers[key] = batcher
+    return batcher
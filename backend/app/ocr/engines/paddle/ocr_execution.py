@@ -17,7 +17,9 @@ from typing import Callable, List, Tuple
 import cv2
 import numpy as np
 
+from app.core.constants import OCR_MICRO_BATCHING
 from .paddle_engine import get_ocr_engine
+from .ocr_batcher import get_ocr_batcher
 from .simplified_preprocessing import SimplifiedPreprocessing
 from .text_correction import CroatianTextCorrector
 from .bosnian_text_correction import BosnianTextCorrector
@@ -29,6 +31,13 @@ logger = logging.getLogger(__name__)
 MIN_TEXT_LENGTH = 3
 
 
+def _predict(ocr_engine, image: np.ndarray):
+    """Run PaddleOCR predict on ocr_engine, batched with concurrent requests when enabled"""
+    if OCR_MICRO_BATCHING:
+        return get_ocr_batcher(ocr_engine).predict(image)
+    return ocr_engine.ocr.predict(image)
+
+
 def ensure_rgb_image(image: np.ndarray, debug: bool = False) -> np.ndarray:
     """
     Ensure image is in RGB format with 3 channels for PaddleOCR.
@@ -85,7 +94,7 @@ def quick_country_detection(image: np.ndarray, debug: bool = False) -> str:
         rgb_image = ensure_rgb_image(image.copy(), debug=False)
 
         # Run quick OCR - just need first ~15 lines to find business IDs
-        ocr_result = ocr_engine.ocr.predict(rgb_image)
+        ocr_result = _predict(ocr_engine, rgb_image)
 
         if not ocr_result or not ocr_result[0]:
             if debug:
@@ -455,7 +464,7 @@ def run_ocr_on_image(
         if debug:
             logger.debug("Running OCR with CLAHE preprocessing")
 
-        ocr_result = ocr_engine.ocr.predict(processed_image)
+        ocr_result = _predict(ocr_engine, processed_image)
 
         # Store raw result for debug session saving
         if return_raw_result and ocr_result and len(ocr_result) > 0:
@@ -504,7 +513,7 @@ def run_ocr_on_image(
             original_rgb = ensure_rgb_image(image.copy(), debug=debug)
 
             # Run OCR on original
-            ocr_result = ocr_engine.ocr.predict(original_rgb)
+            ocr_result = _predict(ocr_engine, original_rgb)
 
             # Store raw result for debug session saving
             if return_raw_result and ocr_result and len(ocr_result) > 0:
@@ -24,14 +24,15 @@ PURPOSE:
 import os
 import cv2
 import logging
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import Any, List
 import numpy as np
 import json
 import datetime
 import traceback
 
 from app.core.constants import DEBUG_IMAGE_DIR, DEBUG_SAVE_FILES
-from .paddle_engine import get_ocr_engine
+from .paddle_engine import PaddleOCREngine, get_ocr_engine
 from .preprocessing_selector import PreprocessingSelector
 # OCR Enhancement strategies have been archived to follow V0.2.5 approach
 from .text_correction import CroatianTextCorrector
@@ -39,6 +40,22 @@ from .text_correction import CroatianTextCorrector
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class OcrAttempt:
+    """
+    One OCR text extracted from an image variant.
+
+    Unpacks like the legacy (text, config_idx, config_str) tuple.
+    """
+    text: str
+    config_idx: int
+    config_str: str
+    variant_idx: int = 0
+
+    def __iter__(self):
+        return iter((self.text, self.config_idx, self.config_str))
+
+
 def calculate_adaptive_threshold(items, debug=False):
     """
     Automatically calculate optimal y_threshold based on actual receipt data.
@@ -256,7 +273,9 @@ def merge_horizontal_text_boxes(rec_texts, rec_scores, rec_boxes,
 
 
 def run_ocr_on_image(image: np.ndarray, configs: List[str] = None, lang: str = 'en', 
-                    debug: bool = False, image_index: int = 0) -> List[Tuple[str, int, str]]:
+                    debug: bool = False, image_index: int = 0,
+                    ocr_engine: PaddleOCREngine = None,
+                    precomputed_result: Any = None) -> List[OcrAttempt]:
     """
     Enhanced OCR with PaddleOCR - maintains same interface as Tesseract version.
     
@@ -266,9 +285,11 @@ def run_ocr_on_image(image: np.ndarray, configs: List[str] = None, lang: str = '
         lang: Language code ('en', 'ch', 'fr', 'german', 'korean', 'japan')
         debug: Enable debug logging and image saving
         image_index: Index for debug file naming
+        ocr_engine: Engine to run on (defaults to the shared singleton)
+        precomputed_result: Prediction for this image from run_ocr_batched (skips predict)
     
     Returns:
-        List of (text, config_index, config_name) tuples for compatibility
+        List of OcrAttempt (unpacks as (text, config_index, config_name) for compatibility)
     """
     if debug:
         logger.info(f"[PADDLE OCR] Processing image #{image_index} (shape: {image.shape})")
@@ -312,7 +333,8 @@ def run_ocr_on_image(image: np.ndarray, configs: List[str] = None, lang: str = '
         # Get OCR engine (supports Croatian with 'en' as it includes Latin characters)
         # For Croatian specifically, PaddleOCR works well with English model + postprocessing
         try:
-            ocr_engine = get_ocr_engine(lang=lang)
+            if ocr_engine is None:
+                ocr_engine = get_ocr_engine(lang=lang)
             if debug:
                 logger.debug(f"[PADDLE OCR] OCR engine obtained successfully")
                 debug_info["steps"].append("Step 1 SUCCESS: OCR engine obtained")
@@ -397,7 +419,10 @@ def run_ocr_on_image(image: np.ndarray, configs: List[str] = None, lang: str = '
                 if debug and debug_info:
                     debug_info["steps"].append(f"Step 8: Calling OCR predict for strategy {strategy}")
                 try:
-                    ocr_result = ocr_engine.ocr.ocr(processed_image)
+                    if precomputed_result is not None:
+                        ocr_result = precomputed_result
+                    else:
+                        ocr_result = ocr_engine.ocr.ocr(processed_image)
                     if debug:
                         logger.debug("OCR processing completed successfully")
                         if debug_info:
@@ -496,7 +521,7 @@ def run_ocr_on_image(image: np.ndarray, configs: List[str] = None, lang: str = '
                         # Only accept meaningful results
                         if cleaned_text and len(cleaned_text.strip()) > 5:
                             config_name = f"paddle_{strategy}_strategy"
-                            results.append((cleaned_text, strategy_idx, config_name))
+                            results.append(OcrAttempt(cleaned_text, strategy_idx, config_name, image_index))
                             
                             if debug:
                                 logger.info(f"[PADDLE OCR] Image #{image_index}, strategy '{strategy}': "
@@ -535,7 +560,10 @@ def run_ocr_on_image(image: np.ndarray, configs: List[str] = None, lang: str = '
                     if debug:
                         logger.debug(f"Fallback - Converted single channel to 3-channel: {original_processed.shape}")
                 
-                ocr_result = ocr_engine.ocr.ocr(original_processed)
+                if precomputed_result is not None:
+                    ocr_result = precomputed_result
+                else:
+                    ocr_result = ocr_engine.ocr.ocr(original_processed)
 
                 if ocr_result and len(ocr_result) > 0:
                     # Extract text from new OCRResult format
@@ -576,7 +604,7 @@ def run_ocr_on_image(image: np.ndarray, configs: List[str] = None, lang: str = '
                         cleaned_text = text_corrector.clean_text(raw_text)
                         
                         if cleaned_text and len(cleaned_text.strip()) > 3:
-                            results.append((cleaned_text, 999, "paddle_original"))
+                            results.append(OcrAttempt(cleaned_text, 999, "paddle_original", image_index))
                             if debug:
                                 logger.info(f"[PADDLE OCR] Original result: {cleaned_text[:50]}...")
                         
@@ -587,8 +615,8 @@ def run_ocr_on_image(image: np.ndarray, configs: List[str] = None, lang: str = '
         if debug:
             logger.info(f"[PADDLE OCR] Image #{image_index} - Total successful extractions: {len(results)}")
             if results:
-                best_result = max(results, key=lambda x: len(x[0]))
-                logger.info(f"[PADDLE OCR] Best result preview: {best_result[0][:100]}...")
+                best_result = max(results, key=lambda x: len(x.text))
+                logger.info(f"[PADDLE OCR] Best result preview: {best_result.text[:100]}...")
     
     except Exception as e:
         error_info = {
@@ -608,4 +636,58 @@ def run_ocr_on_image(image: np.ndarray, configs: List[str] = None, lang: str = '
         debug_info["success"] = len(results) > 0
     save_debug_info()
     
-    return results
\ No newline at end of file
+    return results
+
+
+def run_ocr_batched(images: List[np.ndarray], lang: str = 'en', debug: bool = False,
+                    image_indices: List[int] = None,
+                    ocr_engine: PaddleOCREngine = None) -> List[List[OcrAttempt]]:
+    """
+    Run OCR on several images with a single PaddleOCR predict call.
+
+    Detection and recognition see all images in one call, so the per-call
+    predictor overhead is paid once. Text extraction per image is the same as
+    run_ocr_on_image.
+
+    Args:
+        images: Input images as numpy arrays
+        lang: Language code (see run_ocr_on_image)
+        debug: Enable debug logging and image saving
+        image_indices: Index of each image for debug file naming (defaults to position)
+        ocr_engine: Engine to run on (defaults to the shared singleton)
+
+    Returns:
+        One run_ocr_on_image result list per input image, in input order
+    """
+    if image_indices is None:
+        image_indices = list(range(len(images)))
+    if ocr_engine is None:
+        ocr_engine = get_ocr_engine(lang=lang)
+
+    # PaddleOCR needs 3-channel input
+    batch = []
+    for image in images:
+        if len(image.shape) == 2 or (len(image.shape) == 3 and image.shape[2] == 1):
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        batch.append(image)
+
+    try:
+        batch_results = ocr_engine.ocr.ocr(batch)
+        if not batch_results or len(batch_results) != len(batch):
+            raise ValueError(f"expected {len(batch)} results, got {len(batch_results) if batch_results else 0}")
+    except Exception as e:
+        # Fall back to one predict call per image
+        logger.warning(f"[PADDLE OCR] Batched predict failed ({e}), running images one by one")
+        return [
+            run_ocr_on_image(image, lang=lang, debug=debug, image_index=index, ocr_engine=ocr_engine)
+            for image, index in zip(images, image_indices, strict=True)
+        ]
+
+    if debug:
+        logger.info(f"[PADDLE OCR] Batched predict on {len(batch)} images")
+
+    return [
+        run_ocr_on_image(image, lang=lang, debug=debug, image_index=index, ocr_engine=ocr_engine,
+                         precomputed_result=[result])
+        for image, index, result in zip(images, image_indices, batch_results, strict=True)
+    ]
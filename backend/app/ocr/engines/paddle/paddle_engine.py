@@ -6,13 +6,20 @@ Core PaddleOCR engine initialization and management.
 
 import logging
 import os
+import threading
 import yaml
 from paddleocr import PaddleOCR
 
+from app.core.constants import PADDLE_USE_TENSORRT, PADDLE_MAX_CPU_THREADS
+
 logger = logging.getLogger(__name__)
 
-# Global singleton instance
-_ocr_engine = None
+# Shared engine instances, one per set of engine options
+_ocr_engines = {}
+_ocr_engine_lock = threading.Lock()
+
+# Engines private to worker threads (see get_thread_ocr_engine)
+_thread_engines = threading.local()
 
 # Path to YAML configuration file (project root)
 YAML_CONFIG_PATH = os.path.normpath(
@@ -43,10 +50,56 @@ def load_yaml_config():
         return None
 
 
+def default_engine_opts():
+    """
+    Inference performance options for the PaddleOCR constructor.
+
+    oneDNN (MKLDNN) kernels with a bounded CPU thread count; TensorRT only
+    when PADDLE_USE_TENSORRT is set and Paddle has CUDA support.
+
+    Returns:
+        dict: PaddleOCR keyword arguments
+    """
+    opts = {
+        "enable_mkldnn": True,
+        "cpu_threads": min(os.cpu_count() or 1, PADDLE_MAX_CPU_THREADS),
+    }
+    if PADDLE_USE_TENSORRT:
+        try:
+            import paddle
+            if paddle.device.is_compiled_with_cuda():
+                opts["use_tensorrt"] = True
+            else:
+                logger.warning("PADDLE_USE_TENSORRT is set but Paddle has no CUDA support, ignoring")
+        except ImportError:
+            pass
+    return opts
+
+
+def gpu_engine_opts():
+    """
+    Inference options for a PaddleOCR engine running on the GPU.
+
+    TensorRT is added when PADDLE_USE_TENSORRT is set.
+
+    Returns:
+        dict: PaddleOCR keyword arguments
+    """
+    opts = {"device": "gpu"}
+    if PADDLE_USE_TENSORRT:
+        opts["use_tensorrt"] = True
+    return opts
+
+
+def _engine_key(engine_opts):
+    """Hashable cache key for an engine_opts dict"""
+    return tuple(sorted(engine_opts.items())) if engine_opts else ()
+
+
 class PaddleOCREngine:
     """Simplified PaddleOCR engine wrapper with Croatian Latin support"""
 
-    def __init__(self, lang=None, config_path=None):
+    def __init__(self, lang=None, config_path=None, engine_opts=None):
         """
         Initialize PaddleOCR engine with YAML configuration support.
 
@@ -54,6 +107,8 @@ class PaddleOCREngine:
             lang (str): Language code - defaults to value from YAML config or 'hr' for Croatian
                        Croatian includes special characters: č, ć, đ, š, ž
             config_path (str): Path to YAML config file - defaults to PaddleOCR.yaml in project root
+            engine_opts (dict): Performance options passed to PaddleOCR on top of the
+                       YAML settings - defaults to default_engine_opts()
 
         Note:
             Configuration is loaded from YAML file (PaddleOCR.yaml) if it exists.
@@ -87,7 +142,7 @@ class PaddleOCREngine:
                 # "max_text_length": yaml_config.get("max_text_length", 25),
                 # Performance parameters
                 # 'use_gpu': yaml_config.get('use_gpu', False),
-                "enable_mkldnn": yaml_config.get("enable_mkldnn", False),
+                "enable_mkldnn": yaml_config.get("enable_mkldnn", True),
             }
             logger.info(f"Using configuration from YAML file: {YAML_CONFIG_PATH}")
             logger.info(
@@ -101,6 +156,14 @@ class PaddleOCREngine:
             }
             logger.info("Using hardcoded default configuration (YAML not found)")
 
+        if engine_opts is None:
+            engine_opts = default_engine_opts()
+            # An explicit YAML setting wins over the default
+            if yaml_config and "enable_mkldnn" in yaml_config:
+                engine_opts["enable_mkldnn"] = yaml_config["enable_mkldnn"]
+        ocr_params.update(engine_opts)
+        logger.info(f"Inference options: {engine_opts}")
+
         # Initialize PaddleOCR
         try:
             self.ocr = PaddleOCR(**ocr_params)
@@ -112,18 +175,51 @@ class PaddleOCREngine:
             raise
 
 
-def get_ocr_engine(lang="hr"):
+def get_ocr_engine(lang="hr", engine_opts=None):
     """
     Get singleton OCR engine instance
 
     Args:
         lang (str): Language code - defaults to 'hr' for Croatian
+        engine_opts (dict): PaddleOCR performance options (see PaddleOCREngine);
+                            one engine is kept per distinct set of options
 
     Returns:
         PaddleOCREngine: Singleton OCR engine instance
     """
-    global _ocr_engine
-    if _ocr_engine is None:
-        _ocr_engine = PaddleOCREngine(lang=lang)
-    return _ocr_engine
+    key = _engine_key(engine_opts)
+    engine = _ocr_engines.get(key)
+    if engine is None:
+        # Double-checked so concurrent first calls load the model only once
+        with _ocr_engine_lock:
+            engine = _ocr_engines.get(key)
+            if engine is None:
+                engine = PaddleOCREngine(lang=lang, engine_opts=engine_opts)
+                _ocr_engines[key] = engine
+    return engine
+
+
+def get_thread_ocr_engine(lang="hr", engine_opts=None):
+    """
+    Get an OCR engine owned by the calling thread
+
+    PaddleOCR predictors must not run concurrently on one instance, so threads
+    that run OCR in parallel each load their own engine (once per thread).
+
+    Args:
+        lang (str): Language code - defaults to 'hr' for Croatian
+        engine_opts (dict): PaddleOCR performance options (see PaddleOCREngine)
+
+    Returns:
+        PaddleOCREngine: Engine instance for the current thread
+    """
+    engines = getattr(_thread_engines, "engines", None)
+    if engines is None:
+        engines = _thread_engines.engines = {}
+    key = _engine_key(engine_opts)
+    engine = engines.get(key)
+    if engine is None:
+        engine = PaddleOCREngine(lang=lang, engine_opts=engine_opts)
+        engines[key] = engine
+    return engine
 
@@ -65,7 +65,7 @@ class SimplifiedPreprocessing:
         if debug_save:
             debug_save("06_preprocessing_clahe", enhanced)
 
-        logger.debug(f"[SIMPLIFIED PREPROCESSING] Applied {self.strategy_name} to {image.shape} image")
+        logger.debug("[SIMPLIFIED PREPROCESSING] Applied %s to %s image", self.strategy_name, image.shape)
         return enhanced
 
     def process_with_scoring(self, image: np.ndarray, ocr_engine, debug_save: Optional[Callable] = None) -> Dict[str, Any]:
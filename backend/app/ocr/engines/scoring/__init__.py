@@ -9,7 +9,7 @@ from .contour_scoring import ContourScorer
 from .receipt_scoring import ReceiptScorer
 
 # Maintain backward compatibility with existing imports
-from .text_scoring import score_ocr_text
+from .text_scoring import score_ocr_text, max_text_score
 from .contour_scoring import score_receipt_contour
 from .receipt_scoring import score_croatian_receipt_quality
 
@@ -18,6 +18,7 @@ __all__ = [
     'ContourScorer',
     'ReceiptScorer',
     'score_ocr_text',
+    'max_text_score',
     'score_receipt_contour',
     'score_croatian_receipt_quality'
 ]
\ No newline at end of file
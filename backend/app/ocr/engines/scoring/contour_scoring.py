@@ -18,10 +18,13 @@ class ContourScorer:
     def __init__(self):
         pass
     
-    def score_contour(self, contour, image_area, image_shape, gray_image):
+    def score_contour(self, contour, image_area, image_shape, gray_image, mean_intensity=None):
         """
         Score contour for receipt detection - prioritizes white receipt areas over dark backgrounds.
         This fixes the wood grain detection issue by heavily favoring white areas.
+
+        mean_intensity is the mean gray level inside the contour, if the caller
+        already measured it (otherwise it is computed from gray_image).
         """
         area = cv2.contourArea(contour)
         if area < 10000:  # Must be substantial for receipt
@@ -34,9 +37,10 @@ class ContourScorer:
         score = 0.0
         
         # 1. WHITENESS SCORE - CRITICAL for fixing wood grain / table detection
-        mask = np.zeros((h_img, w_img), np.uint8)
-        cv2.drawContours(mask, [contour], -1, (255,), -1)
-        mean_intensity = cv2.mean(gray_image, mask=mask)[0]
+        if mean_intensity is None:
+            mask = np.zeros((h_img, w_img), np.uint8)
+            cv2.drawContours(mask, [contour], -1, (255,), -1)
+            mean_intensity = cv2.mean(gray_image, mask=mask)[0]
 
         # STRENGTHENED: Much stronger whiteness bias to favor receipts over dark backgrounds
         if mean_intensity > 200:  # Very white (receipt paper)
@@ -90,8 +94,8 @@ class ContourScorer:
         elif edge_samples > 20:  # Medium contrast
             score += 5.0
         
-        logger.debug(f"[CONTOUR SCORE] Area: {area}, Mean intensity: {mean_intensity:.1f}, "
-                    f"Aspect: {aspect_ratio:.2f}, Score: {score:.1f}")
+        logger.debug("[CONTOUR SCORE] Area: %s, Mean intensity: %.1f, Aspect: %.2f, Score: %.1f",
+                     area, mean_intensity, aspect_ratio, score)
         
         return max(score, 0.0)
     
@@ -121,7 +125,7 @@ class ContourScorer:
 
 
 # Backward compatibility function
-def score_receipt_contour(contour, image_area, image_shape, gray_image):
+def score_receipt_contour(contour, image_area, image_shape, gray_image, mean_intensity=None):
     """Backward compatibility wrapper for contour scoring"""
     scorer = ContourScorer()
-    return scorer.score_contour(contour, image_area, image_shape, gray_image)
\ No newline at end of file
+    return scorer.score_contour(contour, image_area, image_shape, gray_image, mean_intensity)
\ No newline at end of file
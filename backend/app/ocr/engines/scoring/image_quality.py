@@ -7,9 +7,13 @@ Scoring functions for image quality assessment for OCR processing.
 import cv2
 import numpy as np
 import logging
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Structuring element for the noise check (opening removes specks smaller than this)
+_NOISE_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+
 
 class ImageQualityScorer:
     """Handles image quality scoring for OCR processing"""
@@ -27,11 +31,11 @@ class ImageQualityScorer:
         if image is None or image.size == 0:
             return 0.0
             
-        # Convert to grayscale if needed
+        # Convert to grayscale if needed (gray is only read, so no copy otherwise)
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         else:
-            gray = image.copy()
+            gray = image
         
         score = 0.0
         
@@ -94,9 +98,10 @@ class ImageQualityScorer:
         
         # 5. NOISE ASSESSMENT - Less noise is better
         # Use morphological opening to detect noise
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-        opened = cv2.morphologyEx(gray, cv2.MORPH_OPEN, kernel)
-        noise_level = np.mean(np.abs(gray.astype(float) - opened.astype(float)))
+        # Opening never brightens a pixel, so gray - opened is already |gray - opened|
+        # and fits in uint8 (no float copies of the image needed)
+        opened = cv2.morphologyEx(gray, cv2.MORPH_OPEN, _NOISE_KERNEL)
+        noise_level = np.mean(cv2.subtract(gray, opened))
         
         if noise_level < 2.0:  # Very clean
             noise_score = 10.0
@@ -169,4 +174,25 @@ class ImageQualityScorer:
 def score_image_quality(image: np.ndarray, debug_name: str = "") -> float:
     """Backward compatibility wrapper for image quality scoring"""
     scorer = ImageQualityScorer()
-    return scorer.score_image_quality(image, debug_name)
\ No newline at end of file
+    return scorer.score_image_quality(image, debug_name)
+
+
+def score_image_quality_batch(images: List[np.ndarray], debug_names: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Score several image variants with one scorer.
+
+    Each image is scored at full resolution, the same as score_image_quality:
+    the sharpness thresholds and the size bonus are calibrated on the real
+    image size, so variants are not downscaled to a common stack.
+
+    Returns:
+        float64 array of scores, aligned with images
+    """
+    scorer = ImageQualityScorer()
+    if debug_names is None:
+        debug_names = [""] * len(images)
+    return np.fromiter(
+        (scorer.score_image_quality(image, name) for image, name in zip(images, debug_names, strict=True)),
+        dtype=np.float64,
+        count=len(images)
+    )
\ No newline at end of file
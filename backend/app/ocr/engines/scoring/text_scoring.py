@@ -9,6 +9,18 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Precompiled scoring patterns (score_text runs on every OCR attempt)
+_PRICE_RE = re.compile(r'\d+[,.]\d{2}')
+_DATE_RE = re.compile(r'\d{1,2}\.\d{1,2}\.\d{2,4}')
+_TIME_RE = re.compile(r'\d{1,2}[:.]\d{2}')
+_SEPARATOR_RE = re.compile(r'-{3,}|={3,}')
+_LONG_WORD_RE = re.compile(r'\b\w{6,}\b')
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Most points score_text can award regardless of text length: business word 3,
+# receipt keywords 11, date 3, time 2, separator 2, long words 10, price bonus 5
+_MAX_FIXED_POINTS = 36
+
 
 class OCRTextScorer:
     """Handles OCR text quality scoring"""
@@ -35,44 +47,46 @@ class OCRTextScorer:
             return 0
         
         lines = [line for line in text.split('\n') if len(line.strip()) > 2]
+        text_lower = text.lower()
         
         # Base score from number of meaningful lines
         score = len(lines) * 1
         
         # Price detection (Croatian decimal format)
-        price_hits = sum(bool(re.search(r'\d+[,.]\d{2}', line)) for line in lines)
+        price_search = _PRICE_RE.search
+        price_hits = sum(1 for line in lines if price_search(line))
         score += price_hits * 2
         
         # Croatian store/business words
-        has_croatian_business = any(word in text.lower() for word in self.croatian_business_words)
+        has_croatian_business = any(word in text_lower for word in self.croatian_business_words)
         if has_croatian_business:
             score += 3
         
         # Croatian receipt keywords
-        croatian_keyword_hits = sum(1 for word in self.croatian_receipt_words if word in text.lower())
+        croatian_keyword_hits = sum(1 for word in self.croatian_receipt_words if word in text_lower)
         score += croatian_keyword_hits * 1
         
         # Date pattern (Croatian format DD.MM.YYYY or DD.MM.YY)
-        if re.search(r'\d{1,2}\.\d{1,2}\.\d{2,4}', text):
+        if _DATE_RE.search(text):
             score += 3
         
         # Time pattern (HH:MM or HH.MM)
-        if re.search(r'\d{1,2}[:.]\d{2}', text):
+        if _TIME_RE.search(text):
             score += 2
         
         # Receipt formatting patterns
-        if re.search(r'-{3,}|={3,}', text):  # Separator lines
+        if _SEPARATOR_RE.search(text):  # Separator lines
             score += 2
         
         # Long coherent words (sign of good OCR)
-        long_words = re.findall(r'\b\w{6,}\b', text)
+        long_words = _LONG_WORD_RE.findall(text)
         score += min(len(long_words), 10)  # Cap at 10 bonus points
         
         # Penalty for too much gibberish
-        words = re.findall(r'\b\w+\b', text.lower())
+        words = _WORD_RE.findall(text_lower)
         if words:
-            short_words = [w for w in words if len(w) <= 2]
-            gibberish_ratio = len(short_words) / len(words)
+            short_words = sum(1 for w in words if len(w) <= 2)
+            gibberish_ratio = short_words / len(words)
             if gibberish_ratio > 0.5:
                 score -= 5
         
@@ -83,8 +97,24 @@ class OCRTextScorer:
         return max(score, 0)  # Ensure non-negative score
 
 
+def max_text_score(length: int) -> int:
+    """
+    Upper bound of score_ocr_text for any text of the given length.
+
+    A counted line needs at least 3 characters plus a newline before the next
+    one and earns at most 3 points (1 for the line, 2 for a price), so at most
+    (length + 1) // 4 lines score; all other points are capped.
+    """
+    if length < 5:
+        return 0
+    return 3 * ((length + 1) // 4) + _MAX_FIXED_POINTS
+
+
+# Shared scorer for the module-level wrapper (it holds only constant word lists)
+_default_scorer = OCRTextScorer()
+
+
 # Backward compatibility function
 def score_ocr_text(text: str) -> int:
     """Backward compatibility wrapper for OCR text scoring"""
-    scorer = OCRTextScorer()
-    return scorer.score_text(text)
\ No newline at end of file
+    return _default_scorer.score_text(text)
\ No newline at end of file
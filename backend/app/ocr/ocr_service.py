@@ -34,16 +34,16 @@ Usage:
 import logging
 
 from app.core.constants import DEBUG_SAVE_FILES
-from app.ocr.pipeline.simple_ocr_pipeline import SimpleOCRPipeline
+from app.ocr.pipeline.simple_ocr_pipeline import get_pipeline
 
 logger = logging.getLogger(__name__)
 
-# Create SimpleOCRPipeline instance with PaddleOCR engine
+# Shared SimpleOCRPipeline instance with PaddleOCR engine (built once per process)
 # UPDATED: Now includes auto country detection for Croatian vs Bosnian receipts
 # Debug file saving controlled by DEBUG_SAVE_FILES environment variable
 # Production (DEBUG_SAVE_FILES=False): Logs only, no files saved
 # Development (DEBUG_SAVE_FILES=True): Saves debug images + JSON for troubleshooting
-ocr_pipeline = SimpleOCRPipeline(debug=DEBUG_SAVE_FILES)
+ocr_pipeline = get_pipeline(debug=DEBUG_SAVE_FILES)
 
 
 def run_ocr_with_fallback(image, debug_utility: bool = False) -> dict:
@@ -17,6 +17,13 @@ from .item_strategies import (
 
 logger = logging.getLogger(__name__)
 
+# Tax and payment lines inside the bounded items section (never items)
+_TAX_PAYMENT_KEYWORDS = (
+    'PDV', 'PNP', 'OSN', 'KARTICA', 'GOTOVINA', 'CASH', 'CARD',
+    'UPLAČENO', 'POVRAT', 'PROMJENA', 'KUSUR', 'CHANGE',
+    'VE:', 'UE:', 'POUE', 'POU:', 'OSNOVICA', 'OSNO'
+)
+
 
 class ItemExtractor:
     """Coordinates multiple item extraction strategies"""
@@ -277,7 +284,7 @@ class ItemExtractor:
         end_idx = None
         for i, line in enumerate(lines):
             line_upper = line.upper()
-            if any(keyword in line_upper for keyword in ['TOTAL', 'UKUPNO', 'SUMA']) and ':' in line:
+            if ('TOTAL' in line_upper or 'UKUPNO' in line_upper or 'SUMA' in line_upper) and ':' in line:
                 end_idx = i  # Items end BEFORE this line
                 if debug:
                     logger.debug(f"[BOUNDED ITEMS] Found END marker on line {i}: '{line}'")
@@ -305,18 +312,12 @@ class ItemExtractor:
             logger.debug(f"[BOUNDED ITEMS] Bounded section: lines {start_idx}-{end_idx-1} ({len(bounded_lines)} lines)")
 
         # Filter out tax and payment lines
-        tax_payment_keywords = [
-            'PDV', 'PNP', 'OSN', 'KARTICA', 'GOTOVINA', 'CASH', 'CARD',
-            'UPLAČENO', 'POVRAT', 'PROMJENA', 'KUSUR', 'CHANGE',
-            'VE:', 'UE:', 'POUE', 'POU:', 'OSNOVICA', 'OSNO'
-        ]
-
         filtered_lines = []
         for i, line in enumerate(bounded_lines):
             line_upper = line.upper()
 
             # Skip if line contains tax/payment keywords
-            is_tax_payment = any(keyword in line_upper for keyword in tax_payment_keywords)
+            is_tax_payment = any(keyword in line_upper for keyword in _TAX_PAYMENT_KEYWORDS)
             if is_tax_payment:
                 if debug:
                     logger.debug(f"[BOUNDED ITEMS] Skipping tax/payment line {start_idx+i}: '{line}'")
@@ -10,53 +10,94 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Total keywords, matched against the upper-cased line by both extract methods
+_TOTAL_KEYWORD_RE = re.compile(r'TOTAL|UKUPNO|SUMA')
+
+# Precompiled price patterns - only run on lines that contain a total keyword
+_PRICE_ANY_RE = re.compile(r'(\d+[.,]\d{1,2})')
+_PRICE2_ANY_RE = re.compile(r'(\d+[.,]\d{2})')
+_PRICE_HEAD_RE = re.compile(r'^(\d+[.,]\d{1,2})')
+_PRICE2_HEAD_RE = re.compile(r'^(\d+[.,]\d{2})')
+
+# (line offset from keyword line, price pattern, min, max) in search order:
+# same line, next line, 2 lines down (in case of blank line)
+_FLEXIBLE_SEARCH = (
+    (0, _PRICE_ANY_RE, None, None),
+    (1, _PRICE_HEAD_RE, 0.5, 2000),  # Reasonable range
+    (2, _PRICE_HEAD_RE, 0.5, 2000),
+)
+_EXPLICIT_SEARCH = (
+    (0, _PRICE2_ANY_RE, 0.01, 10000),  # Reasonable range for receipt total
+    (1, _PRICE2_HEAD_RE, 0.01, 10000),
+    (2, _PRICE2_HEAD_RE, 0.01, 10000),
+)
+_OFFSET_LABELS = ("same line", "next line", "2 lines down")
+
+
+def _parse_price(price_str: str) -> float:
+    """
+    Parse a price matched by the patterns above ("59,29", "59.29", "7,5").
+
+    The grammar is always digits, one separator, 1-2 digits, so we skip the
+    replace() + float() round trip. A single division of exact integers is
+    correctly rounded, giving the same result as float("59.29").
+    """
+    sep = price_str.find(',')
+    if sep < 0:
+        sep = price_str.find('.')
+    frac = price_str[sep + 1:]
+    scale = 10 ** len(frac)
+    return (int(price_str[:sep]) * scale + int(frac)) / scale
+
+
+def _try_price(
+    line: str,
+    pattern: re.Pattern[str],
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None
+) -> Optional[float]:
+    """Match a price with the given pattern and return it if within range"""
+    price_match = pattern.search(line)
+    if not price_match:
+        return None
+
+    price = _parse_price(price_match.group(1))
+    if min_value is not None and price < min_value:
+        return None
+    if max_value is not None and price > max_value:
+        return None
+    return price
+
 
 class TotalExtractor:
     """Extracts total amounts from receipt text"""
-    
+
     def extract_total_flexible(self, lines: list[str]) -> Optional[float]:
         """Extract total with flexible UKUPNO detection (handles split-line format)"""
+        line_count = len(lines)
         for i, line in enumerate(lines):
-            line_lower = line.lower()
+            line_upper = line.upper()
 
             # Look for total keywords
-            if re.search(r'ukupno|total|suma', line_lower):
-                # Try to extract price from same line
-                price_match = re.search(r'(\d+[.,]\d{1,2})', line)
-                if price_match:
-                    try:
-                        return float(price_match.group(1).replace(',', '.'))
-                    except ValueError:
-                        pass
-
-                # Check next line for standalone price (handles "UKUPNO (EUR) :" on one line, "2,10" on next)
-                if i + 1 < len(lines):
-                    next_line = lines[i + 1].strip()
-                    # Look for price pattern at start of next line
-                    next_price_match = re.match(r'^(\d+[.,]\d{1,2})', next_line)
-                    if next_price_match:
-                        try:
-                            price = float(next_price_match.group(1).replace(',', '.'))
-                            if 0.5 <= price <= 2000:  # Reasonable range
-                                return price
-                        except ValueError:
-                            pass
-
-                # Also check 2 lines down (in case there's a blank line)
-                if i + 2 < len(lines):
-                    line_after = lines[i + 2].strip()
-                    after_price_match = re.match(r'^(\d+[.,]\d{1,2})', line_after)
-                    if after_price_match:
-                        try:
-                            price = float(after_price_match.group(1).replace(',', '.'))
-                            if 0.5 <= price <= 2000:  # Reasonable range
-                                return price
-                        except ValueError:
-                            pass
+            if _TOTAL_KEYWORD_RE.search(line_upper):
+                # Same line, then standalone price on next lines
+                # (handles "UKUPNO (EUR) :" on one line, "2,10" on next)
+                for offset, pattern, min_value, max_value in _FLEXIBLE_SEARCH:
+                    j = i + offset
+                    if j >= line_count:
+                        break
+                    price = _try_price(lines[j].strip() if offset else line, pattern, min_value, max_value)
+                    if price is not None:
+                        return price
 
         return None
 
-    def extract_total_explicit(self, lines: list[str], debug: bool = False) -> Optional[float]:
+    def extract_total_explicit(
+        self,
+        lines: list[str],
+        debug: bool = False,
+        upper_lines: Optional[list[str]] = None
+    ) -> Optional[float]:
         """
         EXPLICIT total extraction with keyword-based rules.
 
@@ -78,73 +119,45 @@ class TotalExtractor:
         Args:
             lines: All receipt lines
             debug: Enable debug logging
+            upper_lines: Optional upper-cased copy of lines (avoids re-upper-casing)
 
         Returns:
             Total amount as float, or None if not found
         """
-        if debug:
-            logger.debug(f"[EXPLICIT TOTAL] Searching in {len(lines)} lines")
+        # Hoisted once: skips building the f-strings below unless DEBUG is actually enabled
+        log_debug = debug and logger.isEnabledFor(logging.DEBUG)
+
+        line_count = len(lines)
+        if log_debug:
+            logger.debug(f"[EXPLICIT TOTAL] Searching in {line_count} lines")
 
         for i, line in enumerate(lines):
-            line_upper = line.upper()
+            line_upper = upper_lines[i] if upper_lines is not None else line.upper()
 
             # Check if this line contains a total keyword
-            has_total_keyword = any(keyword in line_upper for keyword in ['TOTAL', 'UKUPNO', 'SUMA'])
-
-            if has_total_keyword:
-                if debug:
+            if _TOTAL_KEYWORD_RE.search(line_upper):
+                if log_debug:
                     logger.debug(f"[EXPLICIT TOTAL] Found keyword on line {i}: '{line}'")
 
-                # Try to extract number from same line first
+                # Same line first, then price at start of the next lines
                 # Pattern: digits, comma/dot, 2 decimal places
                 # Match patterns like: "59,29", "59.29", "159,00"
-                price_match = re.search(r'(\d+[.,]\d{2})', line)
-                if price_match:
-                    price_str = price_match.group(1).replace(',', '.')
-                    try:
-                        total = float(price_str)
-                        if 0.01 <= total <= 10000:  # Reasonable range for receipt total
-                            if debug:
-                                logger.debug(f"[EXPLICIT TOTAL] Found total on same line: {total}")
-                            return total
-                    except ValueError:
-                        pass
-
-                # Check next line for standalone price
-                if i + 1 < len(lines):
-                    next_line = lines[i + 1].strip()
-                    if debug:
-                        logger.debug(f"[EXPLICIT TOTAL] Checking next line {i+1}: '{next_line}'")
-
-                    # Look for price at start of next line
-                    next_match = re.match(r'^(\d+[.,]\d{2})', next_line)
-                    if next_match:
-                        price_str = next_match.group(1).replace(',', '.')
-                        try:
-                            total = float(price_str)
-                            if 0.01 <= total <= 10000:
-                                if debug:
-                                    logger.debug(f"[EXPLICIT TOTAL] Found total on next line: {total}")
-                                return total
-                        except ValueError:
-                            pass
-
-                # Check 2 lines down (in case of blank line)
-                if i + 2 < len(lines):
-                    line_after = lines[i + 2].strip()
-                    after_match = re.match(r'^(\d+[.,]\d{2})', line_after)
-                    if after_match:
-                        price_str = after_match.group(1).replace(',', '.')
-                        try:
-                            total = float(price_str)
-                            if 0.01 <= total <= 10000:
-                                if debug:
-                                    logger.debug(f"[EXPLICIT TOTAL] Found total 2 lines down: {total}")
-                                return total
-                        except ValueError:
-                            pass
-
-        if debug:
+                for offset, pattern, min_value, max_value in _EXPLICIT_SEARCH:
+                    j = i + offset
+                    if j >= line_count:
+                        break
+
+                    candidate = lines[j].strip() if offset else line
+                    if log_debug and offset == 1:
+                        logger.debug(f"[EXPLICIT TOTAL] Checking next line {j}: '{candidate}'")
+
+                    total = _try_price(candidate, pattern, min_value, max_value)
+                    if total is not None:
+                        if log_debug:
+                            logger.debug(f"[EXPLICIT TOTAL] Found total on {_OFFSET_LABELS[offset]}: {total}")
+                        return total
+
+        if log_debug:
             logger.debug("[EXPLICIT TOTAL] No total found")
 
-        return None
\ No newline at end of file
+        return None
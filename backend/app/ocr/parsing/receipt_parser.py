@@ -6,7 +6,7 @@ Coordinates all specialized modules for parsing Croatian receipts.
 
 import logging
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 
 from .text_preprocessing.text_cleaner import TextCleaner
 from .extractors.section_detector import ReceiptSectionDetector
@@ -19,49 +19,95 @@ from .extractors.item_extractor import ItemExtractor
 from .extractors.total_extractor import TotalExtractor
 from .extractors.date_extractor import DateExtractor
 from .validators.item_validator import ItemValidator
+from .validators.item_math import ItemArrays
 from .validators.receipt_validator import ReceiptValidator
 from .extractors.tab_separated_parser import TabSeparatedParser
 
 logger = logging.getLogger(__name__)
 
+# Common Bosnian cities appended to the store name on the first receipt line
+# (single-word cities; BANJA LUKA is checked separately as a word pair)
+_BA_CITIES = frozenset({
+    'SARAJEVO', 'MOSTAR', 'TUZLA', 'ZENICA', 'JABLANICA',
+    'BIHAC', 'TREBINJE', 'LIVNO', 'KONJIC'
+})
+
+# Country indicators as single alternations, matched against the upper-cased
+# receipt lines in one pass each. Plain substring semantics (no word boundaries),
+# so e.g. KONZU still matches KONZUM.
+_BOSNIAN_INDICATORS_RE = re.compile(
+    r'JIB|PIB|IBFM'  # Business IDs
+    r'|CONFIG[ -]?FISCAL'  # Footer branding
+    r'|FISKALNI'  # Receipt type (also covers FISKALNI RACUN)
+    r'|MOSTAR|JABLANICA|SARAJEVO|BANJA LUKA|TUZLA|ZENICA'  # Cities
+    r'|KONZU|BINGO|DIONI'  # Common Bosnian stores
+)
+# Currency display is folded in as well - Bosnian receipts DON'T show currency
+# symbols, Croatian receipts show EUR
+_CROATIAN_INDICATORS_RE = re.compile(
+    r'ZKI|JIR|OIB'
+    r'|SPLIT|ZAGREB|RIJEKA|DUBROVNIK|OSIJEK|ZADAR'
+    r'|\b(?:EUR|€)\b'  # Currency display
+)
+
 
 class ReceiptParser:
     """Main orchestrator for Croatian receipt parsing"""
-    
+
+    # Stateless components - created once at import and shared by all parsers
+    text_cleaner = TextCleaner()
+    section_detector = ReceiptSectionDetector()
+    tax_extractor = TaxExtractor()
+    company_info_extractor = CompanyInfoExtractor()
+    fiscal_extractor = FiscalExtractor()
+    store_extractor = StoreExtractor()
+    item_extractor = ItemExtractor()
+    total_extractor = TotalExtractor()
+    date_extractor = DateExtractor()
+    item_validator = ItemValidator()
+    receipt_validator = ReceiptValidator()
+
     def __init__(self):
-        """Initialize all specialized parsing components"""
-        self.text_cleaner = TextCleaner()
-        self.section_detector = ReceiptSectionDetector()
+        """Initialize the per-instance parsing components (they keep state between calls)"""
         self.schema_detector = ReceiptSchemaDetector()
-        self.tax_extractor = TaxExtractor()
-        self.company_info_extractor = CompanyInfoExtractor()
-        self.fiscal_extractor = FiscalExtractor()
-        self.store_extractor = StoreExtractor()
-        self.item_extractor = ItemExtractor()
-        self.total_extractor = TotalExtractor()
-        self.date_extractor = DateExtractor()
-        self.item_validator = ItemValidator()
-        self.receipt_validator = ReceiptValidator()
         self.structured_parser = TabSeparatedParser()
     
-    def parse_receipt(self, lines: List[str], log_debug: bool = False) -> Dict[str, Any]:
-        """Main parsing function - flexible receipt parsing for variable formats"""
+    def parse_receipt(
+        self,
+        lines: Iterable[str],
+        log_debug: bool = False,
+        include_display: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Main parsing function - flexible receipt parsing for variable formats
+
+        Args:
+            lines: Raw OCR text lines - any iterable (list, generator, file), consumed once
+            log_debug: Enable debug logging
+            include_display: Build the formatted "*_display" strings (set False for
+                batch callers that format amounts themselves; the fields are None)
+        """
         if log_debug:
             logger.setLevel(logging.DEBUG)
 
-        clean_lines = [line.strip() for line in lines if line.strip()]
+        # Strip every line exactly once (single pass, so streamed input is never
+        # materialized twice)
+        clean_lines = [stripped for line in lines if (stripped := line.strip())]
 
         if not clean_lines:
             return self.receipt_validator.create_empty_receipt()
 
+        # Upper-case once; shared with the keyword-based detectors below
+        upper_lines = [line.upper() for line in clean_lines]
+
         # Detect receipt country (Croatian, Bosnian, or Unknown)
-        country = self._detect_receipt_country(clean_lines)
+        country = self._detect_receipt_country(clean_lines, upper_lines=upper_lines)
         if log_debug:
             logger.debug(f"[COUNTRY DETECTION] Receipt country: {country}")
 
         try:
             # First try structured parsing for well-formatted receipts
-            if self._is_structured_receipt(clean_lines):
+            if self._is_structured_receipt(clean_lines, upper_lines=upper_lines):
                 if log_debug:
                     logger.debug("=== TRYING STRUCTURED PARSING ===")
                 structured_result = self.structured_parser.parse_structured_receipt(clean_lines, debug=log_debug)
@@ -92,9 +138,7 @@ class ReceiptParser:
                 full_line = clean_lines[0].strip()
 
                 # Remove city name from store name (e.g., "KONZUM d.o.o. SARAJEVO" → "KONZUM d.o.o.")
-                # Common Bosnian cities: SARAJEVO, MOSTAR, BANJA LUKA, TUZLA, ZENICA, JABLANICA, etc.
-                city_pattern = r'\s+(SARAJEVO|MOSTAR|BANJA\s+LUKA|TUZLA|ZENICA|JABLANICA|BIHAC|TREBINJE|LIVNO|KONJIC)$'
-                store_name = re.sub(city_pattern, '', full_line, flags=re.IGNORECASE).strip()
+                store_name = self._remove_city_suffix(full_line)
 
                 if log_debug:
                     logger.debug(f"[BOSNIAN] Extracted store from line 0: '{full_line}' → '{store_name}'")
@@ -142,7 +186,9 @@ class ReceiptParser:
 
             # Total - USE EXPLICIT EXTRACTION
             # Searches for TOTAL:/UKUPNO:/SUMA: keywords
-            total = self.total_extractor.extract_total_explicit(clean_lines, debug=log_debug)
+            total = self.total_extractor.extract_total_explicit(
+                clean_lines, debug=log_debug, upper_lines=upper_lines
+            )
 
             # Tax - extract tax information
             # Tax information often appears after the items and before payment methods
@@ -201,7 +247,11 @@ class ReceiptParser:
             )
 
             # STEP 3: Detect receipt schema and validate items against it
-            schema = self.schema_detector.detect_schema(clean_lines, items, sections, debug=log_debug)
+            # (both steps read the same item columns, so build them once)
+            item_arrays = ItemArrays.from_items(items) if items else None
+            schema = self.schema_detector.detect_schema(
+                clean_lines, items, sections, debug=log_debug, item_arrays=item_arrays
+            )
 
             # Override currency based on detected country
             if schema and country == "BA":
@@ -215,7 +265,9 @@ class ReceiptParser:
 
             # Validate items against schema (enforces price×qty=total if schema has that pattern)
             if items and schema:
-                items = self.schema_detector.validate_items_against_schema(items, schema, debug=log_debug)
+                items = self.schema_detector.validate_items_against_schema(
+                    items, schema, debug=log_debug, item_arrays=item_arrays
+                )
                 if log_debug:
                     logger.debug(f"[SCHEMA VALIDATION] {schema.items_validated} items passed, "
                                f"{schema.items_failed_validation} failed")
@@ -229,6 +281,18 @@ class ReceiptParser:
             # Calculate confidence score
             confidence = self.receipt_validator.calculate_confidence(store_name, date, items, total)
 
+            # Display fields (optional, for UI)
+            total_display = None
+            total_before_tax_display = None
+            if include_display and schema:
+                if total:
+                    total_display = f"{total:.2f} {schema.currency}"
+                if total_before_tax:
+                    total_before_tax_display = f"{total_before_tax:.2f} {schema.currency}"
+
+            # Business IDs default to None when no company info was found
+            company_ids = company_info or {}
+
             # Build result with all new fields
             result = {
                 "store": store_name,
@@ -244,8 +308,8 @@ class ReceiptParser:
                 "total_tax": total_tax,
 
                 # Display fields (optional, for UI)
-                "total_display": f"{total:.2f} {schema.currency}" if total and schema else None,
-                "total_before_tax_display": f"{total_before_tax:.2f} {schema.currency}" if total_before_tax and schema else None,
+                "total_display": total_display,
+                "total_before_tax_display": total_before_tax_display,
 
                 # Tax information (simplified - just total tax amount)
                 "tax_summary": tax_summary if tax_summary else None,  # Summary by tax type (PDV, PNP) - kept for compatibility
@@ -254,14 +318,14 @@ class ReceiptParser:
                 "payment_method": schema.payment_method if schema else None,
 
                 # Croatian identifiers
-                "oib": company_info.get("oib") if company_info else None,
+                "oib": company_ids.get("oib"),
                 "zki": fiscal_codes.get("zki"),
                 "jir": fiscal_codes.get("jir"),
 
                 # Bosnian identifiers
-                "jib": company_info.get("jib") if company_info else None,
-                "pib": company_info.get("pib") if company_info else None,
-                "ibfm": company_info.get("ibfm") if company_info else None,
+                "jib": company_ids.get("jib"),
+                "pib": company_ids.get("pib"),
+                "ibfm": company_ids.get("ibfm"),
                 "digital_signature": fiscal_codes.get("digital_signature"),
 
                 # Items
@@ -283,67 +347,73 @@ class ReceiptParser:
             logger.error(f"Receipt parsing failed: {str(e)}")
             return self.receipt_validator.create_empty_receipt(error=str(e))
     
-    def _is_structured_receipt(self, lines: List[str]) -> bool:
+    def _remove_city_suffix(self, line: str) -> str:
+        """Remove a trailing Bosnian city name (compares the last words, no regex)"""
+        words = line.rsplit(None, 2)
+        if len(words) < 2:
+            return line
+
+        if words[-1].upper() in _BA_CITIES:
+            return line.rsplit(None, 1)[0].strip()
+
+        if len(words) == 3 and words[-2].upper() == 'BANJA' and words[-1].upper() == 'LUKA':
+            return words[0].strip()
+
+        return line
+
+    def _is_structured_receipt(self, lines: List[str], upper_lines: Optional[List[str]] = None) -> bool:
         """Detect if this is a structured receipt with tab-separated format"""
         # Look for the characteristic structured format indicators
-        for line in lines:
-            line_lower = line.lower()
-            
-            # Check for structured header pattern
-            if ('naziv' in line_lower and 'cijena' in line_lower and 
-                'kol' in line_lower and 'iznos' in line_lower):
+        for i, line in enumerate(lines):
+            # Check for tab-separated content first - cheapest test, no allocation
+            # (more than 2 tabs suggests structured format)
+            if '\t' in line and line.count('\t') >= 2:
                 return True
-            
-            # Check for tab-separated content (more than 2 tabs suggests structured format)
-            if line.count('\t') >= 2:
+
+            # Check for structured header pattern
+            line_upper = upper_lines[i] if upper_lines is not None else line.upper()
+            if ('NAZIV' in line_upper and 'CIJENA' in line_upper and
+                'KOL' in line_upper and 'IZNOS' in line_upper):
                 return True
-        
+
         return False
 
-    def _detect_receipt_country(self, lines: List[str]) -> str:
+    def _detect_receipt_country(self, lines: List[str], upper_lines: Optional[List[str]] = None) -> str:
         """
         Auto-detect receipt country based on identifiers and patterns.
 
+        Args:
+            lines: Cleaned receipt lines
+            upper_lines: Optional upper-cased copy of lines (avoids re-upper-casing)
+
         Returns:
             "HR" (Croatia), "BA" (Bosnia), or "UNKNOWN"
         """
-        text_blob = " ".join(lines).upper()
-
-        # Bosnian indicators (check first - more specific)
-        bosnian_indicators = [
-            'JIB', 'PIB', 'IBFM',  # Business IDs
-            'CONFIG FISCAL', 'CONFIG-FISCAL', 'CONFIGFISCAL',  # Footer branding
-            'FISKALNI RACUN', 'FISKALNI',  # Receipt type
-            'MOSTAR', 'JABLANICA', 'SARAJEVO', 'BANJA LUKA', 'TUZLA', 'ZENICA',  # Cities
-            'KONZU', 'BINGO', 'DIONI'  # Common Bosnian stores
-        ]
-
-        # Croatian indicators
-        croatian_indicators = [
-            'ZKI', 'JIR', 'OIB',
-            'SPLIT', 'ZAGREB', 'RIJEKA', 'DUBROVNIK', 'OSIJEK', 'ZADAR'
-        ]
-
-        # Check for currency display - Bosnian receipts DON'T show currency symbols
-        # Croatian receipts show EUR
-        has_currency = bool(re.search(r'\b(EUR|€)\b', text_blob))
-
-        # Count indicators
-        bosnian_count = sum(1 for ind in bosnian_indicators if ind in text_blob)
-        croatian_count = sum(1 for ind in croatian_indicators if ind in text_blob)
-
-        # Bosnian detection (priority)
-        if bosnian_count > 0:
-            return "BA"
-
-        # Croatian detection
-        if croatian_count > 0 or has_currency:
+        # Walk lines instead of upper-casing one joined blob: most Bosnian
+        # receipts are identified by the header, so we can stop early
+        is_croatian = False
+        for i, line in enumerate(lines):
+            line_upper = upper_lines[i] if upper_lines is not None else line.upper()
+
+            # Bosnian detection (priority - more specific)
+            if _BOSNIAN_INDICATORS_RE.search(line_upper):
+                return "BA"
+
+            # Croatian detection (identifiers, cities or EUR currency display)
+            # - keep scanning, a later Bosnian indicator wins
+            if not is_croatian and _CROATIAN_INDICATORS_RE.search(line_upper):
+                is_croatian = True
+
+        if is_croatian:
             return "HR"
 
         return "UNKNOWN"
 
 
-def parse_receipt(lines: List[str], log_debug: bool = False) -> Dict[str, Any]:
+# Shared parser for the convenience function below
+_PARSER = ReceiptParser()
+
+
+def parse_receipt(lines: Iterable[str], log_debug: bool = False, include_display: bool = True) -> Dict[str, Any]:
     """Convenience function for backward compatibility"""
-    parser = ReceiptParser()
-    return parser.parse_receipt(lines, log_debug=log_debug)
\ No newline at end of file
+    return _PARSER.parse_receipt(lines, log_debug=log_debug, include_display=include_display)
\ No newline at end of file
@@ -7,64 +7,64 @@ Detects Croatian receipt patterns with OCR corruption tolerance.
 import re
 from .text_cleaner import TextCleaner
 
+# Croatian column headers with OCR variations (one alternation, first hit wins)
+_HEADER_RE = re.compile('|'.join([
+    # Original + common OCR corruptions
+    r'naz[ij]v',  # naziv, naziv
+    r'[nc][ij]jena',  # cijena, njena, cijjena
+    r'[kc]ol',  # kol
+    r'[ij]znos',  # iznos
+    # Combined header patterns
+    r'naz[ij]v.*[nc][ij]jena',
+    r'naz[ij]v.*kol.*[ij]znos',
+]))
+
+# Croatian product indicators
+_PRODUCT_RE = re.compile('|'.join([
+    # Food/drink categories
+    r'kava|cokolada|sir|mlijeko|jogurt|kruh|mesa|riba',
+    r'pivo|vino|sok|voda|tea|cola|pepsi',
+    r'jabuka|banana|naranc|limun|groz|jagod',
+    # Common Croatian prefixes/suffixes
+    r'[a-z]+ski|[a-z]+cki|[a-z]+ni|[a-z]+na',
+    # Measurement units
+    r'kg|gr|kom|lit|ml|kut',
+    # Common product words
+    r'veliki|mali|bijeli|crni|fresh|novo'
+]))
+
+# All patterns here run on lower-cased text; lower() once per line is cheaper than
+# re.IGNORECASE, which slows every character comparison
+_DIACRITICS_RE = re.compile(r'[čćžšđ]')
+_CONSONANTS_RE = re.compile(r'[bcdfghjklmnpqrstvwxz]')
+
 
 class CroatianPatternMatcher:
     """Detects Croatian-specific patterns in OCR text"""
-    
+
     def __init__(self):
         """Initialize pattern matcher with text cleaner"""
         self.text_cleaner = TextCleaner()
-    
+
     def fuzzy_match_croatian_patterns(self, line: str) -> bool:
         """Check if line matches Croatian receipt patterns with OCR corruption tolerance"""
         line_lower = line.lower().strip()
         cleaned_line = self.text_cleaner.clean_ocr_line(line_lower)
-        
-        # Croatian column headers with OCR variations
-        header_patterns = [
-            # Original + common OCR corruptions
-            r'naz[ij]v',  # naziv, naziv  
-            r'[nc][ij]jena',  # cijena, njena, cijjena
-            r'[kc]ol',  # kol
-            r'[ij]znos',  # iznos
-            # Combined header patterns
-            r'naz[ij]v.*[nc][ij]jena',
-            r'naz[ij]v.*kol.*[ij]znos',
-        ]
-        
-        for pattern in header_patterns:
-            if re.search(pattern, cleaned_line):
-                return True
-                
-        return False
-    
+
+        return bool(_HEADER_RE.search(cleaned_line))
+
     def looks_like_croatian_product_name(self, line: str) -> bool:
         """Check if line looks like a Croatian product name"""
         line_clean = line.lower().strip()
         if len(line_clean) < 2:
             return False
-        
-        # Croatian product indicators
-        croatian_indicators = [
-            # Food/drink categories
-            r'kava|cokolada|sir|mlijeko|jogurt|kruh|mesa|riba',
-            r'pivo|vino|sok|voda|tea|cola|pepsi',
-            r'jabuka|banana|naranc|limun|groz|jagod',
-            # Common Croatian prefixes/suffixes
-            r'[a-z]+ski|[a-z]+cki|[a-z]+ni|[a-z]+na',
-            # Measurement units
-            r'kg|gr|kom|lit|ml|kut',
-            # Common product words
-            r'veliki|mali|bijeli|crni|fresh|novo'
-        ]
-        
-        for pattern in croatian_indicators:
-            if re.search(pattern, line_clean):
-                return True
-        
+
+        if _PRODUCT_RE.search(line_clean):
+            return True
+
         # General Croatian text pattern (more consonants, specific letter combinations)
-        if (re.search(r'[čćžšđ]', line_clean) or  # Croatian diacritics
-            len(re.findall(r'[bcdfghjklmnpqrstvwxz]', line_clean)) > len(line_clean) * 0.4):
+        if (_DIACRITICS_RE.search(line_clean) or  # Croatian diacritics
+            len(_CONSONANTS_RE.findall(line_clean)) > len(line_clean) * 0.4):
             return True
-            
-        return False
\ No newline at end of file
+
+        return False
@@ -5,6 +5,21 @@ Handles OCR corruption and noise removal from Croatian receipt text.
 """
 
 import re
+import string
+
+# Precompiled cleaning patterns (clean_ocr_line runs on every OCR line)
+_REPEAT_RE = re.compile(r'(.)\1{3,}')
+_DUP_DJ_RE = re.compile(r'[đĐ]{2,}')
+# UPDATED: Preserve + symbol for product names like "PILE+COCA COLA"
+_KEEP_RE = re.compile(r'[^a-zA-ZčćžšđĆČŽŠĐ0-9\s.,:\-€()+]+')
+_WS_RE = re.compile(r'\s+')
+
+# Same filter for pure-ASCII lines as a bytes.translate delete table: every ASCII
+# byte that _KEEP_RE would drop (isspace() matches what \s matches)
+_ASCII_DROP = bytes(
+    code for code in range(128)
+    if not (chr(code) in string.ascii_letters + string.digits + '.,:-()+' or chr(code).isspace())
+)
 
 
 class TextCleaner:
@@ -25,16 +40,19 @@ class TextCleaner:
         cleaned = line
         
         # Remove excessive repeated characters (OCR artifacts)
-        cleaned = re.sub(r'(.)\1{3,}', r'\1\1', cleaned)
+        cleaned = _REPEAT_RE.sub(r'\1\1', cleaned)
         
         # Clean obvious OCR noise patterns (but DON'T mess with letters vs numbers!)
-        cleaned = re.sub(r'[đĐ]{2,}', 'd', cleaned)  # Multiple croatian chars
-        # UPDATED: Preserve + symbol for product names like "PILE+COCA COLA"
-        cleaned = re.sub(r'[^a-zA-ZčćžšđĆČŽŠĐ0-9\s.,:\-€()+]+', '', cleaned)  # Remove weird chars but keep +
+        cleaned = _DUP_DJ_RE.sub('d', cleaned)  # Multiple croatian chars
+        # Remove weird chars but keep +
+        if cleaned.isascii():
+            cleaned = cleaned.encode('ascii').translate(None, _ASCII_DROP).decode('ascii')
+        else:
+            cleaned = _KEEP_RE.sub('', cleaned)
 
         # NOTE: We removed the letter/number substitutions - those are handled by OCR correction now
         
         # Clean up whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _WS_RE.sub(' ', cleaned).strip()
         
         return cleaned
\ No newline at end of file
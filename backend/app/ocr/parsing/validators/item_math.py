@@ -0,0 +1,91 @@
+"""
+Item Math Helpers
+=================
+Vectorized price × quantity = total and value range checks shared by the
+schema detector and the item validator.
+"""
+
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# (quantity, price_per_item, total) in one C call; raises KeyError if a field is missing
+_NUMERIC_FIELDS = itemgetter("quantity", "price_per_item", "total")
+
+
+@dataclass
+class ItemArrays:
+    """
+    Column view of a parsed item list (structure of arrays).
+
+    Built once so the numeric checks of a validation stage read contiguous
+    float64 arrays instead of doing dict lookups per item. ``items`` keeps
+    the original dicts in the same order.
+    """
+
+    items: List[Dict[str, Any]]
+    quantity: np.ndarray  # Missing quantity counts as 1 for the math check
+    price: np.ndarray
+    total: np.ndarray
+    has_quantity: np.ndarray  # False where the item has no 'quantity' key
+
+    @classmethod
+    def from_items(cls, items: List[Dict[str, Any]]) -> "ItemArrays":
+        count = len(items)
+        try:
+            # Fast path: the item strategies set all three fields, so read them in one pass
+            rows = np.array(
+                [_NUMERIC_FIELDS(item) for item in items], dtype=np.float64
+            ).reshape(count, 3)
+        except KeyError:
+            # Some item lacks a field (e.g. fallback items carry 'price'): per-field defaults
+            has_quantity = np.fromiter(
+                ("quantity" in item for item in items), dtype=bool, count=count
+            )
+            quantity = np.fromiter(
+                (item.get("quantity", 1) for item in items),
+                dtype=np.float64,
+                count=count,
+            )
+            price = np.fromiter(
+                (item.get("price_per_item", 0) for item in items),
+                dtype=np.float64,
+                count=count,
+            )
+            total = np.fromiter(
+                (item.get("total", 0) for item in items), dtype=np.float64, count=count
+            )
+            return cls(items, quantity, price, total, has_quantity)
+
+        quantity, price, total = np.ascontiguousarray(rows.T)
+        return cls(items, quantity, price, total, np.ones(count, dtype=bool))
+
+    def take(self, indices: List[int]) -> "ItemArrays":
+        """View of the rows at the given positions, in that order"""
+        return ItemArrays(
+            [self.items[i] for i in indices],
+            self.quantity[indices],
+            self.price[indices],
+            self.total[indices],
+            self.has_quantity[indices],
+        )
+
+    def math_diffs(self) -> np.ndarray:
+        """|price × quantity - total| for every item"""
+        return np.abs(self.quantity * self.price - self.total)
+
+    def value_flags(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (non_positive, excessive) masks over quantity, price and total.
+        Missing fields count as 0, so they are flagged as non-positive.
+        """
+        non_positive = (
+            ~self.has_quantity
+            | (self.quantity <= 0)
+            | (self.price <= 0)
+            | (self.total <= 0)
+        )
+        excessive = (self.quantity > 100) | (self.price > 500) | (self.total > 1000)
+        return non_positive, excessive
@@ -5,10 +5,41 @@ Validates and cleans parsed items from Croatian receipts.
 """
 
 import logging
-from typing import List, Dict, Optional, Any
+import re
+from typing import List, Dict, Optional, Any, Tuple
+
+import numpy as np
+
+from .item_math import ItemArrays
 
 logger = logging.getLogger(__name__)
 
+# Names (substrings) that are obviously not products
+_INVALID_NAMES = [
+    'ukupno', 'ukupn0', 'total', 'suma', 'placanje', 'novcanice',  # Added ukupn0 (OCR error)
+    'racun', 'ra0un', 'broj', 'datum', 'konobar', 'sto', 'stol',  # Added OCR variants
+    'porez', 'pdv', 'osnovica', 'stopa', 'iznos', 'izn0s',
+    '(eur)', 'eur:', 'kuna', 'hrk',  # Currency indicators
+    'ae', 's 555 5e', 'd8c', 'odbc bob',  # OCR artifacts
+    'jena k', 'na', 'izr', 'sgrgggavo'  # More OCR junk
+]
+# One compiled alternation tests all names in a single scan of the item name
+_INVALID_NAME_RE = re.compile('|'.join(re.escape(name) for name in _INVALID_NAMES))
+
+# Names (substrings) of a total line; an item matching the receipt total with one
+# of these in its name is the total itself, not a product
+_TOTAL_INDICATORS = ('ukupno', 'total', 'suma', 'sveukupno', 'placanje')
+_TOTAL_INDICATOR_RE = re.compile('|'.join(_TOTAL_INDICATORS))
+
+# Letter candidates: word characters that are not digits or underscore. This also
+# admits numeric symbols such as '½', so hits are confirmed with isalpha()
+_HAS_ALPHA_RE = re.compile(r'[^\W\d_]')
+
+
+def _has_letter(name: str) -> bool:
+    """Same result as any(char.isalpha() for char in name), scanned in C"""
+    return any(match.group().isalpha() for match in _HAS_ALPHA_RE.finditer(name))
+
 
 class ItemValidator:
     """Validates and cleans parsed receipt items"""
@@ -17,19 +48,50 @@ class ItemValidator:
         """Remove invalid items that are actually totals or store information"""
         if not items:
             return items
-        
+
+        return self._clean_items(items, expected_total, debug, ItemArrays.from_items(items))[0]
+
+    def validate_and_score(self, items: List[Dict[str, Any]], expected_total: Optional[float],
+                           debug: bool = False) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        validate_and_clean_items + calculate_items_confidence on the kept items.
+
+        Both steps share one ItemArrays, so each item's fields are read only once.
+
+        Returns:
+            (valid_items, confidence)
+        """
+        if not items:
+            return items, 0.0
+
+        item_arrays = ItemArrays.from_items(items)
+        valid_items, kept = self._clean_items(items, expected_total, debug, item_arrays)
+        confidence = self.calculate_items_confidence(valid_items, expected_total, item_arrays=item_arrays.take(kept))
+        return valid_items, confidence
+
+    def _clean_items(self, items: List[Dict[str, Any]], expected_total: Optional[float], debug: bool,
+                     item_arrays: ItemArrays) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Body of validate_and_clean_items. Also returns the positions of the kept
+        items, and writes corrected prices back into item_arrays.
+        """
         valid_items = []
-        
-        for item in items:
-            item_name = item.get('name', '').lower().strip()
+        kept = []
+
+        # Numeric checks for all items at once; the loop below only indexes the masks
+        non_positive, excessive = item_arrays.value_flags()
+        math_diffs = item_arrays.math_diffs()
+
+        for idx, item in enumerate(items):
+            name = item.get('name', '').strip()
+            item_name = name.lower()
             item_total = item.get('total', 0)
             
             # Remove items that are actually totals
             # BUT: Only if the name looks like a total line (not a product name)
             if expected_total and abs(item_total - expected_total) < 0.01:
                 # Check if name looks like a total indicator (not a product)
-                total_indicators = ['ukupno', 'total', 'suma', 'sveukupno', 'placanje']
-                if any(indicator in item_name for indicator in total_indicators):
+                if _TOTAL_INDICATOR_RE.search(item_name):
                     if debug:
                         logger.debug(f"  REMOVED TOTAL AS ITEM: {item}")
                     continue
@@ -46,68 +108,55 @@ class ItemValidator:
 
             
             # Remove items with names that are obviously not products
-            invalid_names = [
-                'ukupno', 'ukupn0', 'total', 'suma', 'placanje', 'novcanice',  # Added ukupn0 (OCR error)
-                'racun', 'ra0un', 'broj', 'datum', 'konobar', 'sto', 'stol',  # Added OCR variants
-                'porez', 'pdv', 'osnovica', 'stopa', 'iznos', 'izn0s',
-                '(eur)', 'eur:', 'kuna', 'hrk',  # Currency indicators
-                'ae', 's 555 5e', 'd8c', 'odbc bob',  # OCR artifacts
-                'jena k', 'na', 'izr', 'sgrgggavo'  # More OCR junk
-            ]
-            
-            if any(invalid in item_name for invalid in invalid_names):
+            if _INVALID_NAME_RE.search(item_name):
                 if debug:
                     logger.debug(f"  REMOVED INVALID NAME: {item}")
                 continue
             
             # Remove items with unreasonable values
-            if (item.get('quantity', 0) <= 0 or 
-                item.get('price_per_item', 0) <= 0 or
-                item.get('total', 0) <= 0):
+            if non_positive[idx]:
                 if debug:
                     logger.debug(f"  REMOVED ZERO/NEGATIVE VALUES: {item}")
                 continue
             
             # Remove items with excessive values
-            if (item.get('quantity', 0) > 100 or
-                item.get('price_per_item', 0) > 500 or
-                item.get('total', 0) > 1000):
+            if excessive[idx]:
                 if debug:
                     logger.debug(f"  REMOVED EXCESSIVE VALUES: {item}")
                 continue
             
             # Validate math consistency
-            quantity = item.get('quantity', 1)
-            price_per_item = item.get('price_per_item', 0)
-            total = item.get('total', 0)
-            
-            expected_total_calc = quantity * price_per_item
-            if abs(expected_total_calc - total) > 0.02:  # Allow small rounding errors
+            if math_diffs[idx] > 0.02:  # Allow small rounding errors
+                quantity = item.get('quantity', 1)
+                total = item.get('total', 0)
                 if debug:
+                    expected_total_calc = quantity * item.get('price_per_item', 0)
                     logger.debug(f"  MATH ERROR - Expected: {expected_total_calc}, Got: {total} for item: {item}")
                 # Try to fix if possible
                 if quantity > 0:
                     corrected_price = total / quantity
                     item['price_per_item'] = round(corrected_price, 2)
+                    item_arrays.price[idx] = item['price_per_item']
                     if debug:
                         logger.debug(f"  CORRECTED price_per_item to: {corrected_price}")
             
             # Remove items with names that are too short or just numbers
-            name = item.get('name', '').strip()
             if len(name) < 2 or name.isdigit():
                 if debug:
                     logger.debug(f"  REMOVED SHORT/NUMERIC NAME: {item}")
                 continue
             
             valid_items.append(item)
+            kept.append(idx)
         
         if debug:
             logger.debug(f"[VALIDATION] Kept {len(valid_items)}/{len(items)} items")
         
-        return valid_items
+        return valid_items, kept
     
-    def calculate_items_confidence(self, items: List[Dict[str, Any]], expected_total: Optional[float]) -> float:
-        """Calculate confidence score for extracted items"""
+    def calculate_items_confidence(self, items: List[Dict[str, Any]], expected_total: Optional[float],
+                                   item_arrays: Optional[ItemArrays] = None) -> float:
+        """Calculate confidence score for extracted items (item_arrays: optional column view of items)"""
         if not items:
             return 0.0
         
@@ -136,30 +185,17 @@ class ItemValidator:
             else:
                 confidence_factors.append(0.2)  # Poor match
         
-        # Factor 3: Item name quality
-        name_quality = 0.0
-        for item in items:
-            name = item.get('name', '').strip()
-            if len(name) >= 5:
-                name_quality += 0.3
-            if any(char.isalpha() for char in name):
-                name_quality += 0.2
-        
-        name_quality = min(name_quality / len(items), 1.0) if items else 0.0
-        confidence_factors.append(name_quality)
-        
-        # Factor 4: Math consistency
-        math_consistency = 0.0
-        for item in items:
-            quantity = item.get('quantity', 1)
-            price_per_item = item.get('price_per_item', 0)
-            total = item.get('total', 0)
-            
-            expected = quantity * price_per_item
-            if abs(expected - total) < 0.02:
-                math_consistency += 1.0
-        
-        math_consistency = math_consistency / len(items) if items else 0.0
+        # Factor 3: Item name quality (0.3 for a long name, 0.2 for one with letters)
+        names = [item.get('name', '').strip() for item in items]
+        long_names = np.fromiter((len(name) >= 5 for name in names), dtype=bool, count=item_count)
+        alpha_names = np.fromiter((_has_letter(name) for name in names), dtype=bool, count=item_count)
+        name_quality = (0.3 * long_names.sum() + 0.2 * alpha_names.sum()) / item_count
+        confidence_factors.append(min(float(name_quality), 1.0))
+
+        # Factor 4: Math consistency (share of items where price × qty = total)
+        if item_arrays is None:
+            item_arrays = ItemArrays.from_items(items)
+        math_consistency = float((item_arrays.math_diffs() < 0.02).mean())
         confidence_factors.append(math_consistency)
         
         # Calculate weighted average
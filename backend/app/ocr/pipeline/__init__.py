@@ -4,9 +4,9 @@ OCR Processing Pipeline
 Simplified pipeline for orchestrating the complete OCR workflow.
 """
 
-from .simple_ocr_pipeline import SimpleOCRPipeline
+from .simple_ocr_pipeline import SimpleOCRPipeline, get_pipeline
 
 # Backward compatibility alias
 OCRPipeline = SimpleOCRPipeline
 
-__all__ = ['SimpleOCRPipeline', 'OCRPipeline']
+__all__ = ['SimpleOCRPipeline', 'OCRPipeline', 'get_pipeline']
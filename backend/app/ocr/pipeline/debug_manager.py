@@ -7,7 +7,9 @@ Handles debug information saving and logging for OCR pipeline.
 import os
 import cv2
 import logging
-from typing import List, Tuple, Any
+import queue
+import threading
+from typing import List, Any
 from app.core.constants import DEBUG_IMAGE_DIR, DEBUG_SAVE_FILES
 
 logger = logging.getLogger(__name__)
@@ -19,38 +21,63 @@ class DebugManager:
     def __init__(self, debug_dir: str = DEBUG_IMAGE_DIR):
         self.debug_dir = debug_dir
         os.makedirs(self.debug_dir, exist_ok=True)
+
+        # Debug files are written by a background thread, off the request path
+        self._q = queue.Queue(maxsize=64)
+        threading.Thread(target=self._worker, name="ocr-debug-writer", daemon=True).start()
     
-    def save_debug_info(self, processed_images: List[Any], best_info: Tuple,
+    def save_debug_info(self, processed_images: List[Any], best_info: Any,
                        best_text: str, best_score: float):
-        """Save debug information for analysis (only if DEBUG_SAVE_FILES=True)."""
+        """Queue debug information for saving (only if DEBUG_SAVE_FILES=True)."""
         # Only save if DEBUG_SAVE_FILES environment variable is True
         if not DEBUG_SAVE_FILES:
             logger.debug("[DEBUG] Skipping debug file save (DEBUG_SAVE_FILES=False)")
             return
 
+        try:
+            self._q.put_nowait((processed_images, best_info, best_text, best_score))
+        except queue.Full:
+            logger.debug("[DEBUG] Debug write queue full, dropping debug info")
+
+    def flush(self):
+        """Block until all queued debug information has been written"""
+        self._q.join()
+
+    def _worker(self):
+        """Write queued debug information to disk"""
+        while True:
+            item = self._q.get()
+            try:
+                self._write_debug_info(*item)
+            finally:
+                self._q.task_done()
+
+    def _write_debug_info(self, processed_images: List[Any], best_info: Any,
+                          best_text: str, best_score: float):
+        """Save debug information for analysis (best_info: the winning OcrAttempt)."""
         try:
             # Save the best OCR source image
-            if best_info[0].startswith("image_"):
-                index = int(best_info[0].split("_")[-1])
+            if best_info is not None:
+                index = best_info.variant_idx
                 if 0 <= index < len(processed_images):
                     best_img = processed_images[index]
                     debug_path = os.path.join(self.debug_dir, "final_best_ocr_source.png")
                     cv2.imwrite(debug_path, best_img)
-                    logger.debug(f"[DEBUG] Saved best OCR source image: {debug_path}")
+                    logger.debug("[DEBUG] Saved best OCR source image: %s", debug_path)
 
             # Save OCR text result
             result_path = os.path.join(self.debug_dir, "best_ocr_result.txt")
             with open(result_path, 'w', encoding='utf-8') as f:
                 f.write(f"OCR Score: {best_score}\n")
-                f.write(f"Config: {best_info[2]}\n")
-                f.write(f"Source: {best_info[0]}\n")
+                f.write(f"Config: {best_info.config_str}\n")
+                f.write(f"Source: image_{best_info.variant_idx}\n")
                 f.write(f"Text Length: {len(best_text)} characters\n")
                 f.write(f"Lines: {len(best_text.splitlines())}\n")
                 f.write("\n" + "="*50 + "\n")
                 f.write("EXTRACTED TEXT:\n")
                 f.write("="*50 + "\n")
                 f.write(best_text)
-            logger.debug(f"[DEBUG] Saved OCR text result: {result_path}")
+            logger.debug("[DEBUG] Saved OCR text result: %s", result_path)
 
         except Exception as e:
             logger.warning(f"[DEBUG] Could not save debug info: {e}")
@@ -26,8 +26,14 @@ PURPOSE:
 
 import os
 import cv2
+import copy
+import hashlib
 import logging
-from typing import Any, Dict
+import numpy as np
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from app.ocr.processor.core import ReceiptProcessor
 from app.ocr.parsing.receipt_parser import ReceiptParser
 from .processing_coordinator import ProcessingCoordinator
@@ -35,37 +41,112 @@ from .debug_manager import DebugManager
 
 logger = logging.getLogger(__name__)
 
+# Successful results kept per pipeline, keyed by a hash of the image bytes
+RESULT_CACHE_SIZE = 512
+
+# Upper bound for threads preprocessing pages in process_image_arrays
+MAX_PREPROCESS_WORKERS = 4
+
 
 class OCRPipeline:
     """Main OCR processing pipeline orchestrator"""
     
-    def __init__(self, debug: bool = True, use_fast: bool = False):
+    def __init__(self, debug: bool = True, use_fast: bool = False,
+                 engine_opts: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            debug: Enable debug logging and debug file output
+            use_fast: Use the fast processing path
+            engine_opts: PaddleOCR performance options (enable_mkldnn, cpu_threads,
+                         use_tensorrt); None uses default_engine_opts()
+        """
         self.debug = debug
         self.use_fast = use_fast
         self.processor = ReceiptProcessor(debug=debug)
         self.parser = ReceiptParser()
-        self.coordinator = ProcessingCoordinator(debug=debug)
+        self.coordinator = ProcessingCoordinator(debug=debug, engine_opts=engine_opts)
         self.debug_manager = DebugManager() if debug else None
+
+        # Result cache for repeated images (retries, re-uploads); off when debugging
+        # so every run produces its debug output
+        self._result_cache = None if debug else OrderedDict()
+        self._result_cache_lock = threading.Lock()
+
+        # Per-thread processors for process_image_arrays (the contour detector
+        # keeps per-call state, so threads can't share self.processor)
+        self._thread_state = threading.local()
         
         logger.info("OCR Pipeline initialized with PaddleOCR engine")
 
+    @staticmethod
+    def _read_file(image_path: str) -> Optional[bytes]:
+        """Read an image file (None if it can't be read)"""
+        try:
+            with open(image_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _decode(data: Optional[bytes]):
+        """Decode encoded image bytes (None if missing or undecodable)"""
+        if not data:
+            return None
+        return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+    def _content_key(self, data: Optional[bytes]) -> Optional[str]:
+        """Cache key for image bytes (None when caching is off)"""
+        if self._result_cache is None or not data:
+            return None
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _get_cached_result(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Copy of the cached result for key, if any"""
+        if key is None:
+            return None
+        with self._result_cache_lock:
+            result = self._result_cache.get(key)
+            if result is None:
+                return None
+            self._result_cache.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def _cache_result(self, key: Optional[str], result: Dict[str, Any]):
+        """Remember a successful result (least recently used entries are evicted)"""
+        if key is None or not result.get("success"):
+            return
+        result = copy.deepcopy(result)
+        with self._result_cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
     def process_single_receipt(self, image_path: str) -> Dict[str, Any]:
         """
         Main processing function - maintains same interface as your original.
         Enhanced with better error handling and processing pipeline.
         """
         try:
-            img = cv2.imread(image_path)
+            data = self._read_file(image_path)
+            cache_key = self._content_key(data)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                cached["image_path"] = image_path
+                logger.info("[MAIN] Returning cached result for %s", image_path)
+                return cached
+
+            img = self._decode(data)
             if img is None:
                 raise ValueError(f"Could not load image: {image_path}")
 
-            logger.info(f"[MAIN] Processing {image_path}")
+            logger.info("[MAIN] Processing %s", image_path)
             
             # Step 1: Process image with improved processor
-            processed_images, status, processing_info = self.processor.process_receipt(img)
+            processed_images, status, processing_info = self.processor.process_receipt(img, debug=self.debug)
             
             if not processed_images:
-                logger.error(f"[MAIN] No processed images returned from processor")
+                logger.error("[MAIN] No processed images returned from processor")
                 return {
                     "success": False,
                     "error": "Image processing failed - no processed images",
@@ -74,39 +155,39 @@ class OCRPipeline:
                 }
 
             # Step 2: Run OCR processing through coordinator
-            best_text, best_score, best_info, all_ocr_attempts = self.coordinator.run_paddleocr_processing(processed_images)
-            logger.info(f"[OCR] PaddleOCR processing on {len(processed_images)} images")
+            best_text, best_score, best_info, attempt_count = self.coordinator.run_paddleocr_processing(processed_images)
+            logger.info("[OCR] PaddleOCR processing on %d images", len(processed_images))
 
             # Step 3: Validate OCR results
-            if not best_text or len(best_text.strip()) < 15:
-                logger.warning(f"[OCR] Insufficient text extracted from {len(processed_images)} images")
-                logger.warning(f"[OCR] Tried {len(all_ocr_attempts)} OCR configurations")
+            stripped = best_text.strip()
+            if len(stripped) < 15:
+                logger.warning("[OCR] Insufficient text extracted from %d images", len(processed_images))
+                logger.warning("[OCR] Tried %d OCR configurations", attempt_count)
                 
                 # Try to provide more helpful error info
-                if all_ocr_attempts:
-                    longest_text = max(all_ocr_attempts, key=lambda x: len(x[0]))[0]
-                    logger.info(f"[OCR] Longest text found: '{longest_text[:100]}...' ({len(longest_text)} chars)")
+                if attempt_count:
+                    logger.info("[OCR] Best attempt preview: '%s...' (%d chars)", best_text[:100], len(best_text))
                 
                 return {
                     "success": False,
                     "error": f"OCR extraction failed - insufficient text (best: {len(best_text)} chars)",
                     "image_path": image_path,
-                    "attempts": len(all_ocr_attempts),
+                    "attempts": attempt_count,
                     "process_status": status,
                     "best_text_preview": best_text[:200] if best_text else ""
                 }
 
             # Step 4: Parse the extracted text
-            logger.info(f"[PARSER] Parsing {len(best_text)} characters with confidence {best_score:.1f}")
+            logger.info("[PARSER] Parsing %d characters with confidence %.1f", len(best_text), best_score)
             
-            lines = best_text.strip().split('\n')
+            lines = stripped.split('\n')
             parsed_receipt = self.parser.parse_receipt(lines, log_debug=self.debug)
             
             # Step 5: Save debug information if enabled
             if self.debug and self.debug_manager:
                 self.debug_manager.save_debug_info(processed_images, best_info, best_text, best_score)
                 self.debug_manager.log_ocr_results(
-                    len(processed_images), best_score, len(best_text), len(all_ocr_attempts)
+                    len(processed_images), best_score, len(best_text), attempt_count
                 )
 
             # Step 6: Build final result
@@ -116,8 +197,8 @@ class OCRPipeline:
                 "ocr_score": best_score,
                 "text_length": len(best_text),
                 "lines_count": len(lines),
-                "attempts": len(all_ocr_attempts),
-                "best_config": best_info[2],
+                "attempts": attempt_count,
+                "best_config": best_info.config_str,
                 "process_status": status,
                 "receipt": parsed_receipt
             }
@@ -126,27 +207,46 @@ class OCRPipeline:
                 result["raw_text"] = best_text
                 result["processing_info"] = processing_info
             
-            logger.info(f"[MAIN] Successfully processed {image_path}: "
-                       f"extracted {len(best_text)} chars, "
-                       f"parsed {len(parsed_receipt.get('items', []))} items")
+            logger.info("[MAIN] Successfully processed %s: extracted %d chars, parsed %d items",
+                        image_path, len(best_text), len(parsed_receipt.get('items', [])))
             
+            self._cache_result(cache_key, result)
             return result
         
         except Exception as e:
-            logger.error(f"[MAIN] Critical error processing {image_path}: {str(e)}")
+            logger.error("[MAIN] Critical error processing %s: %s", image_path, e)
             return {
                 "success": False,
                 "error": f"Processing failed: {str(e)}",
                 "image_path": image_path
             }
 
+    def process_image_bytes(self, data: bytes) -> Dict[str, Any]:
+        """Process an encoded image (e.g. an upload) without touching the filesystem"""
+        cache_key = self._content_key(data)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            logger.info("[MAIN] Returning cached result for image bytes")
+            return cached
+
+        image = self._decode(data)
+        if image is None:
+            logger.error("[MAIN] Could not decode image bytes")
+            return {
+                "success": False,
+                "error": "Could not decode image data"
+            }
+        result = self.process_image_array(image)
+        self._cache_result(cache_key, result)
+        return result
+
     def process_image_array(self, image: Any) -> Dict[str, Any]:
         """Process image from numpy array or similar format"""
         try:
             logger.info("[MAIN] Processing image from array")
             
             # Step 1: Process image
-            processed_images, status, processing_info = self.processor.process_receipt(image)
+            processed_images, status, _ = self.processor.process_receipt(image, debug=self.debug)
             
             if not processed_images:
                 return {
@@ -156,18 +256,113 @@ class OCRPipeline:
                 }
 
             # Step 2: Run OCR processing
-            best_text, best_score, best_info, all_ocr_attempts = self.coordinator.run_paddleocr_processing(processed_images)
+            ocr_output = self.coordinator.run_paddleocr_processing(processed_images)
+            
+        except Exception as e:
+            logger.error("[MAIN] Critical error processing image array: %s", e)
+            return {
+                "success": False,
+                "error": f"Processing failed: {str(e)}"
+            }
+
+        return self._build_array_result(processed_images, status, *ocr_output)
+
+    def process_image_arrays(self, images: List[Any],
+                             max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Process several images (e.g. the pages of a document) as one batch.
+
+        Pages are preprocessed in parallel threads and their OCR shares predict
+        calls (see ProcessingCoordinator.run_paddleocr_processing_pages).
+
+        Args:
+            images: Images as numpy arrays
+            max_workers: Preprocessing threads (default: CPU count, capped at
+                         MAX_PREPROCESS_WORKERS)
 
+        Returns:
+            One process_image_array result per image, in input order
+        """
+        if not images:
+            return []
+
+        logger.info("[MAIN] Processing %d images as a batch", len(images))
+
+        # Step 1: Process images
+        if max_workers is None:
+            max_workers = min(len(images), os.cpu_count() or 1, MAX_PREPROCESS_WORKERS)
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ocr-preprocess") as pool:
+                prepared = list(pool.map(self._preprocess_page, images))
+        else:
+            prepared = [self._preprocess_page(image) for image in images]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(images)
+        ocr_pages = []
+        for p, (processed_images, status, error) in enumerate(prepared):
+            if error is not None:
+                results[p] = {
+                    "success": False,
+                    "error": f"Processing failed: {error}"
+                }
+            elif not processed_images:
+                results[p] = {
+                    "success": False,
+                    "error": "Image processing failed - no processed images",
+                    "process_status": status
+                }
+            else:
+                ocr_pages.append(p)
+
+        # Step 2: Run OCR processing on all pages together
+        try:
+            ocr_outputs = self.coordinator.run_paddleocr_processing_pages(
+                [prepared[p][0] for p in ocr_pages]
+            )
+        except Exception as e:
+            logger.error("[MAIN] Critical error running OCR on image batch: %s", e)
+            ocr_outputs = None
+            for p in ocr_pages:
+                results[p] = {
+                    "success": False,
+                    "error": f"Processing failed: {str(e)}"
+                }
+
+        if ocr_outputs is not None:
+            for p, ocr_output in zip(ocr_pages, ocr_outputs, strict=True):
+                processed_images, status, _ = prepared[p]
+                results[p] = self._build_array_result(processed_images, status, *ocr_output)
+
+        return results
+
+    def _preprocess_page(self, image: Any) -> Tuple[Optional[List[Any]], Any, Optional[str]]:
+        """Run the image processor on one page: (processed_images, status, error)"""
+        processor = getattr(self._thread_state, "processor", None)
+        if processor is None:
+            processor = ReceiptProcessor(debug=self.debug)
+            self._thread_state.processor = processor
+        try:
+            processed_images, status, _ = processor.process_receipt(image, debug=self.debug)
+            return processed_images, status, None
+        except Exception as e:
+            logger.error("[MAIN] Critical error processing image array: %s", e)
+            return None, None, str(e)
+
+    def _build_array_result(self, processed_images: List[Any], status: Any, best_text: str,
+                            best_score: float, best_info: Any, attempt_count: int) -> Dict[str, Any]:
+        """Validate and parse the OCR output of an image array"""
+        try:
             # Step 3: Validate and parse
-            if not best_text or len(best_text.strip()) < 15:
+            stripped = best_text.strip()
+            if len(stripped) < 15:
                 return {
                     "success": False,
                     "error": f"OCR extraction failed - insufficient text (best: {len(best_text)} chars)",
-                    "attempts": len(all_ocr_attempts),
+                    "attempts": attempt_count,
                     "process_status": status
                 }
 
-            lines = best_text.strip().split('\n')
+            lines = stripped.split('\n')
             parsed_receipt = self.parser.parse_receipt(lines, log_debug=self.debug)
             
             # Step 4: Debug output
@@ -183,8 +378,31 @@ class OCRPipeline:
             }
             
         except Exception as e:
-            logger.error(f"[MAIN] Critical error processing image array: {str(e)}")
+            logger.error("[MAIN] Critical error processing image array: %s", e)
             return {
                 "success": False,
                 "error": f"Processing failed: {str(e)}"
-            }
\ No newline at end of file
+            }
+
+
+# Pipelines built so far, keyed by (debug, use_fast)
+_PIPELINE_CACHE: Dict[Tuple[bool, bool], OCRPipeline] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def get_pipeline(debug: bool = True, use_fast: bool = False) -> OCRPipeline:
+    """
+    Get the shared OCRPipeline for this configuration, building it on first use.
+
+    Constructing a pipeline sets up the processor, parser and coordinator, so
+    request handlers should use this instead of instantiating OCRPipeline.
+    """
+    key = (debug, use_fast)
+    pipeline = _PIPELINE_CACHE.get(key)
+    if pipeline is None:
+        with _CACHE_LOCK:
+            pipeline = _PIPELINE_CACHE.get(key)
+            if pipeline is None:
+                pipeline = OCRPipeline(debug=debug, use_fast=use_fast)
+                _PIPELINE_CACHE[key] = pipeline
+    return pipeline
\ No newline at end of file
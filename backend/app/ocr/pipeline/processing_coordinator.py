@@ -19,85 +19,291 @@ PURPOSE:
 """
 
 import logging
-from typing import List, Tuple, Any
-from app.ocr.engines.paddle.paddle_coordinator import run_ocr_on_image
-from app.ocr.engines.scoring.text_scoring import score_ocr_text
-from app.ocr.engines.scoring.image_quality import score_image_quality
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple, Any, Optional, Dict
+from app.ocr.engines.paddle.paddle_coordinator import OcrAttempt, run_ocr_on_image, run_ocr_batched
+from app.ocr.engines.paddle.paddle_engine import get_ocr_engine, get_thread_ocr_engine
+from app.ocr.engines.paddle.gpu_worker import get_gpu_ocr_engine
+from app.ocr.engines.onnx.onnx_engine import get_onnx_engine
+from app.core.constants import RECEIPT_OCR_BACKEND, RECEIPT_OCR_USE_GPU
+from app.ocr.engines.scoring.text_scoring import score_ocr_text, max_text_score
+from app.ocr.engines.scoring.image_quality import score_image_quality_batch
 
 logger = logging.getLogger(__name__)
 
+# PaddleOCR English model works well for Croatian text
+OCR_LANG = 'en'
+
+# Up to this many variants (after the top-ranked one) go through one batched
+# predict call on the shared engine
+MAX_BATCH_VARIANTS = 4
+
+# Single-variant pages OCR'd together in one predict call by run_paddleocr_processing_pages
+MAX_PAGE_BATCH = 8
+
+# Upper bound for parallel OCR workers - every worker loads its own PaddleOCR model,
+# and the workers only start when more than MAX_BATCH_VARIANTS variants follow the
+# top-ranked one
+MAX_OCR_WORKERS = 4
+
+# Final score at which the remaining (lower-quality) variants are skipped
+EARLY_EXIT_SCORE = 150.0
+
+# Image quality whose weight (quality / 50) leaves the text score unchanged
+NEUTRAL_IMAGE_QUALITY = 50.0
+
 
 class ProcessingCoordinator:
     """Coordinates OCR processing across multiple images and configurations"""
     
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, max_workers: Optional[int] = None,
+                 early_exit_score: Optional[float] = EARLY_EXIT_SCORE,
+                 engine_opts: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            debug: Enable debug logging
+            max_workers: Variants OCR'd in parallel when more than MAX_BATCH_VARIANTS
+                         follow the top-ranked one (default: CPU count, capped at
+                         MAX_OCR_WORKERS). 1 runs them sequentially on the shared engine.
+            early_exit_score: Stop after the first variant whose best score reaches
+                              this value (None always runs every variant)
+            engine_opts: PaddleOCR performance options (enable_mkldnn, cpu_threads, ...)
+                         for the engines this coordinator uses (None: engine defaults)
+        """
         self.debug = debug
+        self.early_exit_score = early_exit_score
+        self.engine_opts = engine_opts
+        self.backend = RECEIPT_OCR_BACKEND
+        if self.backend == "onnx":
+            try:
+                get_onnx_engine()
+            except (ImportError, FileNotFoundError) as e:
+                logger.warning("[PADDLEOCR] ONNX backend unavailable (%s), using PaddleOCR", e)
+                self.backend = "paddle"
+        elif self.backend == "paddle" and RECEIPT_OCR_USE_GPU:
+            try:
+                get_gpu_ocr_engine(lang=OCR_LANG)
+                self.backend = "paddle_gpu"
+            except RuntimeError as e:
+                logger.warning("[PADDLEOCR] GPU worker unavailable (%s), using PaddleOCR on CPU", e)
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, MAX_OCR_WORKERS)
+        self.max_workers = max_workers
+        # Created on first use (see _get_pool): each worker thread loads its own model
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Worker pool for parallel variant OCR (None when max_workers is 1)"""
+        if self.max_workers <= 1:
+            return None
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # PaddleOCR inference runs in native code that releases the GIL, so
+                    # threads overlap the per-variant OCR calls
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="paddleocr"
+                    )
+        return self._pool
+
+    def _get_engine(self, per_thread: bool = False):
+        """OCR engine for the configured backend (per_thread: the calling worker's own Paddle engine)"""
+        if self.backend == "onnx":
+            # ONNX Runtime sessions are thread-safe, one engine serves every worker
+            return get_onnx_engine()
+        if self.backend == "paddle_gpu":
+            # The GPU worker process serializes requests from every thread
+            return get_gpu_ocr_engine(lang=OCR_LANG)
+        if per_thread:
+            return get_thread_ocr_engine(lang=OCR_LANG, engine_opts=self.engine_opts)
+        return get_ocr_engine(lang=OCR_LANG, engine_opts=self.engine_opts)
+
+    def _ocr_variant(self, image: Any, image_index: int, per_thread: bool = False) -> List[OcrAttempt]:
+        """Run OCR on one variant (per_thread: on the pool worker's own engine)"""
+        return run_ocr_on_image(
+            image,
+            debug=self.debug,
+            image_index=image_index,
+            lang=OCR_LANG,
+            ocr_engine=self._get_engine(per_thread=per_thread)
+        )
+
+    def _start_variants(self, processed_images: List[Any], indices: List[int]
+                        ) -> Tuple[Optional[List[List[OcrAttempt]]], Optional[List[Future]]]:
+        """
+        Start OCR on the variants at indices (in rank order)
+
+        Returns:
+            (batched results, pending futures), aligned with indices: up to
+            MAX_BATCH_VARIANTS variants go through one batched predict call, more
+            run in worker threads. Both are None when the variants are left to run
+            one by one (a single variant, or max_workers is 1)
+        """
+        if len(indices) <= 1:
+            return None, None
+        if len(indices) <= MAX_BATCH_VARIANTS:
+            batched = run_ocr_batched(
+                [processed_images[i] for i in indices],
+                lang=OCR_LANG,
+                debug=self.debug,
+                image_indices=indices,
+                ocr_engine=self._get_engine()
+            )
+            return batched, None
+        pool = self._get_pool()
+        if pool is None:
+            return None, None
+        return None, [pool.submit(self._ocr_variant, processed_images[i], i, True) for i in indices]
     
-    def run_paddleocr_processing(self, processed_images: List[Any]) -> Tuple[str, float, Tuple, List]:
-        """Run PaddleOCR processing on all image variants"""
+    def run_paddleocr_processing(self, processed_images: List[Any],
+                                 precomputed: Optional[List[List[OcrAttempt]]] = None
+                                 ) -> Tuple[str, float, Optional[OcrAttempt], int]:
+        """
+        Run PaddleOCR processing on all image variants
+
+        Args:
+            processed_images: Image variants of one receipt
+            precomputed: OCR results per variant (by variant index) from an earlier
+                         batched run; skips running OCR here
+
+        Returns:
+            (best_text, best_score, best attempt or None, number of OCR attempts)
+        """
         best_text = ""
         best_score = -1
-        best_info = ("", -1, "")
-        all_ocr_attempts = []
+        best_info = None
+        attempt_count = 0
         
-        # First, score all images for quality
-        image_quality_scores = []
-        for i, p_img in enumerate(processed_images):
-            quality_score = score_image_quality(p_img, f"variant_{i}")
-            image_quality_scores.append(quality_score)
+        if len(processed_images) == 1:
+            # Nothing to rank: skip quality scoring, use the neutral quality (weight 1.0)
+            image_quality_scores = [NEUTRAL_IMAGE_QUALITY]
+            quality_sorted_indices = [0]
+        else:
+            # First, score all images for quality
+            image_quality_scores = score_image_quality_batch(
+                processed_images, [f"variant_{i}" for i in range(len(processed_images))]
+            ).tolist()
+
+            # Sort images by quality (highest first)
+            quality_sorted_indices = sorted(range(len(processed_images)), 
+                                          key=lambda i: image_quality_scores[i], 
+                                          reverse=True)
 
-        # Sort images by quality (highest first)
-        quality_sorted_indices = sorted(range(len(processed_images)), 
-                                      key=lambda i: image_quality_scores[i], 
-                                      reverse=True)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[PADDLEOCR] Image quality scores: %s",
+                            ", ".join([f"variant_{i}={image_quality_scores[i]:.1f}" 
+                                      for i in quality_sorted_indices]))
 
-        logger.info(f"[PADDLEOCR] Image quality scores: " + 
-                   ", ".join([f"variant_{i}={image_quality_scores[i]:.1f}" 
-                             for i in quality_sorted_indices]))
+        # Variants go to OCR at full resolution on purpose: PaddleOCR limits the
+        # side length only for detection and crops the text lines for recognition
+        # from the input image, so shrinking tall receipts here (e.g. to a
+        # 960px long side) would cost recognition accuracy for a negligible resize
+
+        # The top-ranked variant runs alone first, so an early exit on it skips OCR
+        # on the others. If it misses early_exit_score, the remaining variants start
+        # together (see _start_variants). Their results are still consumed in rank
+        # order below, so best-result selection is the same as a sequential run
+        batched = None
+        pending = None
 
         for rank, i in enumerate(quality_sorted_indices):
-            p_img = processed_images[i]
             image_quality = image_quality_scores[i]
             
-            logger.info(f"[PADDLEOCR] Processing variant {i} (rank {rank+1}/{len(processed_images)}, "
-                       f"quality={image_quality:.1f})")
+            logger.info("[PADDLEOCR] Processing variant %d (rank %d/%d, quality=%.1f)",
+                        i, rank + 1, len(processed_images), image_quality)
             
-            # Run PaddleOCR
-            ocr_results = run_ocr_on_image(
-                p_img, 
-                debug=self.debug, 
-                image_index=i,
-                lang='en'  # PaddleOCR English model works well for Croatian text
-            )
-            all_ocr_attempts.extend(ocr_results)
+            # Run PaddleOCR (or collect the result of the batched/parallel run)
+            if precomputed is not None:
+                ocr_results = precomputed[i]
+            elif batched is not None:
+                ocr_results = batched[rank - 1]
+            elif pending is not None:
+                ocr_results = pending[rank - 1].result()
+            else:
+                ocr_results = self._ocr_variant(processed_images[i], i)
+            attempt_count += len(ocr_results)
+
+            # Weight final score by image quality
+            quality_weight = min(image_quality / 50.0, 2.5)  # Max 2.5x boost for high quality
 
             # Evaluate each OCR result with quality weighting
-            for text, config_idx, config_str in ocr_results:
+            for attempt in ocr_results:
+                text = attempt.text
                 if not text or len(text.strip()) < 10:
                     continue
+
+                # Skip scoring a text too short to beat the current best
+                if max_text_score(len(text)) * quality_weight <= best_score:
+                    continue
                 
                 text_score = score_ocr_text(text)
-                
-                # Weight final score by image quality
-                quality_weight = min(image_quality / 50.0, 2.5)  # Max 2.5x boost for high quality
                 final_score = text_score * quality_weight
                 
-                logger.debug(f"[PADDLEOCR] variant_{i}: text_score={text_score}, "
-                           f"quality_weight={quality_weight:.2f}, "
-                           f"final_score={final_score:.1f}")
+                logger.debug("[PADDLEOCR] variant_%s: text_score=%s, quality_weight=%.2f, final_score=%.1f",
+                             i, text_score, quality_weight, final_score)
                 
                 if final_score > best_score:
                     best_score = final_score
                     best_text = text
-                    best_info = (f"image_{i}", config_idx, config_str)
+                    best_info = attempt
                     
                     if self.debug:
-                        logger.info(f"[PADDLEOCR] New best result (score {final_score:.1f}): "
-                                  f"config='{config_str}', preview='{text[:80]}...'")
+                        logger.info("[PADDLEOCR] New best result (score %.1f): config='%s', preview='%s...'",
+                                    final_score, attempt.config_str, text[:80])
+
+            # Variants are in quality order, so a result this good is not worth
+            # beating with the remaining ones
+            if self.early_exit_score is not None and best_score >= self.early_exit_score:
+                if rank + 1 < len(quality_sorted_indices):
+                    logger.info("[PADDLEOCR] Early exit after rank %d/%d (score %.1f)",
+                                rank + 1, len(processed_images), best_score)
+                    if pending is not None:
+                        for future in pending[rank:]:
+                            future.cancel()
+                break
+
+            if rank == 0 and precomputed is None:
+                batched, pending = self._start_variants(processed_images, quality_sorted_indices[1:])
         
-        return best_text, best_score, best_info, all_ocr_attempts
+        return best_text, best_score, best_info, attempt_count
+    
+    def run_paddleocr_processing_pages(self, pages: List[List[Any]]
+                                       ) -> List[Tuple[str, float, Optional[OcrAttempt], int]]:
+        """
+        Run PaddleOCR processing on several receipts (e.g. the pages of a document)
+
+        Pages with a single variant are OCR'd MAX_PAGE_BATCH at a time in one
+        predict call; pages with several variants go through
+        run_paddleocr_processing as usual.
+
+        Returns:
+            One run_paddleocr_processing result per page, in input order
+        """
+        results: List[Optional[Tuple[str, float, Optional[OcrAttempt], int]]] = [None] * len(pages)
+
+        single = [p for p, variants in enumerate(pages) if len(variants) == 1]
+        for start in range(0, len(single), MAX_PAGE_BATCH):
+            chunk = single[start:start + MAX_PAGE_BATCH]
+            batched = run_ocr_batched(
+                [pages[p][0] for p in chunk],
+                lang=OCR_LANG,
+                debug=self.debug,
+                image_indices=[0] * len(chunk),
+                ocr_engine=self._get_engine()
+            )
+            for p, ocr_results in zip(chunk, batched, strict=True):
+                results[p] = self.run_paddleocr_processing(pages[p], precomputed=[ocr_results])
+
+        for p, variants in enumerate(pages):
+            if results[p] is None:
+                results[p] = self.run_paddleocr_processing(variants)
+
+        return results
     
-    def evaluate_ocr_results(self, ocr_results: List[Tuple[str, int, str]], 
+    def evaluate_ocr_results(self, ocr_results: List[OcrAttempt], 
                            image_quality: float) -> List[Tuple[str, float]]:
         """Evaluate OCR results with quality weighting"""
         evaluated_results = []
@@ -13,18 +13,20 @@ Key Features:
 - 3-5 second processing target
 """
 
+import bisect
 import logging
-import time
+import operator
 import os
-import cv2
-import numpy as np
-from typing import Dict, Any
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
-# Core components
-from app.ocr.processor.core import ReceiptProcessor
-from app.ocr.parsing.receipt_parser import ReceiptParser
-from app.ocr.engines.paddle import run_ocr_on_image
-from app.ocr.engines.paddle.simplified_preprocessing import SimplifiedPreprocessing
+# Core components (cv2, numpy, PaddleOCR) are imported where they are used, so
+# importing this module stays cheap until a pipeline is built
+if TYPE_CHECKING:
+    import numpy as np
 
 # Optional debug modules - not required for production
 try:
@@ -38,6 +40,29 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Croatian letters counted in the OCR quality metrics. Summing str.count over
+# them runs in C; a code-point array pass (utf-32 buffer + np.isin) measured
+# about 2x slower on receipt-sized texts
+_CROATIAN_CHARS = ("č", "ć", "ž", "š", "đ", "Č", "Ć", "Ž", "Š", "Đ")
+
+# Quality levels by OCR text score: QUALITY_LEVELS[i] covers scores from
+# QUALITY_THRESHOLDS[i - 1] (inclusive) up to QUALITY_THRESHOLDS[i]
+QUALITY_THRESHOLDS = (1.0, 2.0, 3.0)
+QUALITY_LEVELS = ("poor", "fair", "good", "excellent")
+
+# Quality metrics reported in quick mode, where scoring is skipped
+NOT_SCORED = (0.0, "not_scored", 0)
+
+# Jobs waiting between two process_batch stages (bounds memory held by crops)
+BATCH_QUEUE_SIZE = 2
+
+# Image files larger than this are decoded at half resolution (a 12 MP phone
+# photo still leaves ~2000px on the long edge, well above the 800px OCR floor)
+REDUCED_DECODE_MIN_BYTES = 4 * 1024 * 1024
+
+# Threads decoding image files in process_batch_files
+MAX_DECODE_WORKERS = 4
+
 
 class SimpleOCRPipeline:
     """
@@ -53,6 +78,12 @@ class SimpleOCRPipeline:
         self.config = None
 
         # Core components
+        from app.ocr.engines.paddle.simplified_preprocessing import (
+            SimplifiedPreprocessing,
+        )
+        from app.ocr.parsing.receipt_parser import ReceiptParser
+        from app.ocr.processor.core import ReceiptProcessor
+
         self.geometric_processor = ReceiptProcessor(debug=debug)
         self.parser = ReceiptParser()
         self.simplified_preprocessor = SimplifiedPreprocessing()
@@ -70,7 +101,7 @@ class SimpleOCRPipeline:
 
     def process_image(
         self,
-        image: np.ndarray,
+        image: "np.ndarray",
         image_filename: str = "uploaded_image.jpg",
         debug_utility: bool = False,
         quick_mode: bool = False,
@@ -89,30 +120,38 @@ class SimpleOCRPipeline:
         Returns:
             Dict containing parsed receipt data and metadata with quality metrics
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
+
+        # Without a debug session, take the path that has no debug hooks at all
+        if not (self.debug_manager and debug_utility):
+            return self._process_image_fast(
+                image,
+                image_filename,
+                debug_utility,
+                quick_mode,
+                enable_parser_debug,
+                start_time,
+            )
 
         # debug_utility enabled - use enhanced scoring and session debugging
-        if debug_utility:
-            logger.info(
-                "[SIMPLE PIPELINE] Debug utility enabled - enhanced scoring and session debugging active"
-            )
+        logger.info(
+            "[SIMPLE PIPELINE] Debug utility enabled - enhanced scoring and session debugging active"
+        )
 
-        # Start debug session if debug_utility enabled
-        debug_session = None
-        if self.debug_manager and debug_utility:
-            if quick_mode:
-                session_mode = "simplified_quick_ocr"
-            else:
-                session_mode = "simplified_full_processing"
+        # Start debug session
+        if quick_mode:
+            session_mode = "simplified_quick_ocr"
+        else:
+            session_mode = "simplified_full_processing"
 
-            debug_session = self.debug_manager.start_session(
-                mode=session_mode,
-                debug_level="full",  # Always full when enabled
-                image=image,
-            )
+        debug_session = self.debug_manager.start_session(
+            mode=session_mode,
+            debug_level="full",  # Always full when enabled
+            image=image,
+        )
 
         try:
-            logger.info(f"[SIMPLE PIPELINE] Starting processing: {image_filename}")
+            logger.info("[SIMPLE PIPELINE] Starting processing: %s", image_filename)
 
             if debug_session:
                 debug_session.set_stage("geometric_processing")
@@ -123,23 +162,13 @@ class SimpleOCRPipeline:
             if debug_session:
                 debug_session.capture_resource_snapshot("geometric_processing_start")
                 # Ensure debug manager has the active session set for geometric processor
-                if self.debug_manager:
-                    self.debug_manager.current_session = debug_session
+                self.debug_manager.current_session = debug_session
                 # Pass debug session to geometric processor for image saving
                 self.geometric_processor.debug_session = debug_session
-            processed_images, status, processing_info = (
-                self.geometric_processor.process_receipt(image)
-            )
+            clean_cropped_image, status = self._crop(image)
             if debug_session:
                 debug_session.capture_resource_snapshot("geometric_processing_end")
 
-            if not processed_images:
-                raise ValueError(f"Geometric processing failed: {status}")
-
-            # Get the perfectly cropped, clean image
-            clean_cropped_image = processed_images[0]
-            logger.info(f"[SIMPLE PIPELINE] Geometric processing: {status}")
-
             # Save cropped image to session and capture image quality metrics
             if debug_session:
                 debug_session.save_visual_debug(
@@ -169,82 +198,37 @@ class SimpleOCRPipeline:
 
                 debug_save_callback = save_preprocessing_image
 
+            from app.ocr.engines.paddle import run_ocr_on_image
+
             # Use run_ocr_on_image with CLAHE-only preprocessing
             # This uses the proven OCR workflow with auto country detection
             # Croatian corrections are ONLY applied to Croatian receipts (not Bosnian)
-            # When debug_utility is enabled, request raw OCR result for debug session saving
-            if debug_utility:
-                ocr_results, raw_ocr_result = run_ocr_on_image(
-                    clean_cropped_image,
-                    lang="hr",  # Croatian/Bosnian Latin script support
-                    debug=self.debug,
-                    auto_detect_country=True,  # Auto-detect and skip Croatian corrections for Bosnian
-                    return_raw_result=True,  # Get raw OCR result for debug session saving
-                    debug_save_callback=debug_save_callback,  # Save preprocessing steps
-                )
-            else:
-                ocr_results = run_ocr_on_image(
-                    clean_cropped_image,
-                    lang="hr",  # Croatian/Bosnian Latin script support
-                    debug=self.debug,
-                    auto_detect_country=True,  # Auto-detect and skip Croatian corrections for Bosnian
-                    debug_save_callback=debug_save_callback,  # Save preprocessing steps
-                )
-                raw_ocr_result = None
+            # Request the raw OCR result as well, for debug session saving
+            ocr_results, raw_ocr_result = run_ocr_on_image(
+                clean_cropped_image,
+                lang="hr",  # Croatian/Bosnian Latin script support
+                debug=self.debug,
+                auto_detect_country=True,  # Auto-detect and skip Croatian corrections for Bosnian
+                return_raw_result=True,  # Get raw OCR result for debug session saving
+                debug_save_callback=debug_save_callback,  # Save preprocessing steps
+            )
 
             if debug_session:
                 debug_session.capture_resource_snapshot("ocr_processing_end")
 
-            if not ocr_results:
-                raise ValueError("OCR processing returned no results")
-
-            # Extract text from OCR results (standard format)
-            # ocr_results is a list of tuples: [(full_text, config_index, config_name), ...]
-            # We need to split the full_text into individual lines for the parser
-            text_lines = []
-            for result in ocr_results:
-                if result[0].strip():
-                    # Split the text into individual lines
-                    lines = result[0].split("\n")
-                    text_lines.extend([line.strip() for line in lines if line.strip()])
-
-            if not text_lines:
-                raise ValueError("OCR processing returned empty text")
-
-            logger.info(
-                f"[SIMPLE PIPELINE] OCR extracted {len(text_lines)} text lines using optimal strategy"
-            )
+            text_lines = self._extract_text_lines(ocr_results)
 
             # Create raw_text for compatibility (but keep text_lines as primary)
             raw_text = "\n".join(text_lines)
 
-            # Calculate quality metrics using the scoring system
-            from app.ocr.engines.scoring.text_scoring import score_ocr_text
-
-            quality_score = score_ocr_text(raw_text)
-
-            # Determine quality level
-            if quality_score >= 3.0:
-                quality_level = "excellent"
-            elif quality_score >= 2.0:
-                quality_level = "good"
-            elif quality_score >= 1.0:
-                quality_level = "fair"
-            else:
-                quality_level = "poor"
-
-            # Count Croatian characters
-            croatian_chars = sum(1 for c in raw_text if c in "čćžšđČĆŽŠĐ")
-
-            logger.info(
-                f"[SIMPLE PIPELINE] OCR quality: {quality_level} (score: {quality_score:.3f}), Croatian chars detected: {croatian_chars}"
+            # Debug sessions record the metrics, so they are scored even in quick mode
+            quality_score, quality_level, croatian_chars = self._score_text_quality(
+                raw_text
             )
 
-            # Save OCR text to session and capture OCR analytics
+            # Capture OCR analytics (raw and processed text are saved with the
+            # OCR boxes below, under ocr_raw_text / ocr_processed_text)
             if debug_session:
-                debug_session.save_text_data(
-                    "ocr_raw_text", raw_text, "ocr_extracted_text.txt"
-                )
                 debug_session.add_ocr_analytics("PaddleOCR", ocr_results, None)
                 # Save quality metrics
                 debug_session.save_json_data(
@@ -262,28 +246,12 @@ class SimpleOCRPipeline:
                 debug_session.set_stage("parsing")
 
             # Step 3: Parsing (skip if quick mode)
-            if quick_mode:
-                logger.info("[SIMPLE PIPELINE] Step 3: Skipped (quick mode - OCR only)")
-                parsed_receipt = {
-                    "store": "Quick OCR Mode",
-                    "items": [],
-                    "total": None,
-                    "raw_text": raw_text,
-                    "text_lines": text_lines,
-                    "quick_mode": True,
-                }
-            else:
-                logger.info("[SIMPLE PIPELINE] Step 3: Universal parsing")
-                if debug_session:
-                    debug_session.capture_resource_snapshot("parsing_start")
-                parsed_receipt = self.parser.parse_receipt(
-                    text_lines, log_debug=enable_parser_debug
-                )
-                if debug_session:
-                    debug_session.capture_resource_snapshot("parsing_end")
+            parsed_receipt = self._parse(
+                text_lines, raw_text, quick_mode, enable_parser_debug, debug_session
+            )
 
             # Calculate processing time
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
 
             # Save parsing results to session and capture final resource snapshot
             if debug_session:
@@ -306,26 +274,36 @@ class SimpleOCRPipeline:
             # Save OCR boxes visualization and detailed data to debug session
             if debug_session and raw_ocr_result:
                 try:
+                    import numpy as np
+
                     # Save boxes visualization
                     debug_session.save_boxes_visualization(
                         clean_cropped_image, raw_ocr_result
                     )
 
-                    # Extract raw OCR text (before corrections)
-                    raw_text_lines = []
-                    ocr_data = []
+                    # Extract raw OCR text (before corrections), one slot per detection
+                    detection_count = len(raw_ocr_result)
+                    raw_text_lines = [None] * detection_count
+                    ocr_data = [None] * detection_count
+                    # Confidence statistics are accumulated in the same pass
+                    confidence_sum = 0.0
+                    high_confidence_count = 0
+                    low_confidence_count = 0
                     for idx, line in enumerate(raw_ocr_result):
                         box = line[0]
                         text, confidence = line[1]
-                        raw_text_lines.append(text)
-                        ocr_data.append(
-                            {
-                                "index": idx,
-                                "text": text,
-                                "confidence": float(confidence),
-                                "box": [[float(p[0]), float(p[1])] for p in box],
-                            }
-                        )
+                        confidence = float(confidence)
+                        confidence_sum += confidence
+                        high_confidence_count += confidence > 0.9
+                        low_confidence_count += confidence < 0.7
+                        raw_text_lines[idx] = text
+                        ocr_data[idx] = {
+                            "index": idx,
+                            "text": text,
+                            "confidence": confidence,
+                            # x, y of each point as plain floats, converted in one call
+                            "box": np.asarray(box, dtype=np.float64)[:, :2].tolist(),
+                        }
 
                     raw_ocr_text = "\n".join(raw_text_lines)
 
@@ -339,26 +317,27 @@ class SimpleOCRPipeline:
                         "ocr_processed_text", raw_text, "10_ocr_processed_text.txt"
                     )
 
-                    # Save text corrections if different
-                    if raw_ocr_text != raw_text:
-                        differences = []
-                        raw_lines = raw_ocr_text.split("\n")
-                        proc_lines = raw_text.split("\n")
-                        for i, (raw_line, proc_line) in enumerate(
-                            zip(raw_lines, proc_lines)
-                        ):
-                            if raw_line != proc_line:
-                                differences.append(
-                                    {"line": i, "raw": raw_line, "processed": proc_line}
-                                )
-                        if differences:
-                            debug_session.save_json_data(
-                                {
-                                    "total_changes": len(differences),
-                                    "changes": differences,
-                                },
-                                "11_text_corrections_applied.json",
+                    # Save text corrections if different (compared line by line: the
+                    # joined texts are just these lists, detections are single lines).
+                    # The comparisons run in map(); dicts are built for changed lines only.
+                    # Only lines present in both lists are compared (empty corrected
+                    # lines are dropped), so the zip is deliberately not strict
+                    changed = list(map(operator.ne, raw_text_lines, text_lines))
+                    if any(changed):
+                        differences = [
+                            {"line": i, "raw": raw_line, "processed": proc_line}
+                            for i, (raw_line, proc_line, is_changed) in enumerate(
+                                zip(raw_text_lines, text_lines, changed, strict=False)
                             )
+                            if is_changed
+                        ]
+                        debug_session.save_json_data(
+                            {
+                                "total_changes": len(differences),
+                                "changes": differences,
+                            },
+                            "11_text_corrections_applied.json",
+                        )
 
                     # Save OCR data with bounding boxes
                     debug_session.save_json_data(
@@ -369,22 +348,16 @@ class SimpleOCRPipeline:
                         "12_ocr_raw_data.json",
                     )
 
-                    # Save detailed quality metrics
+                    # Save detailed quality metrics (confidences gathered in the loop above)
                     avg_confidence = (
-                        sum(line[1][1] for line in raw_ocr_result) / len(raw_ocr_result)
-                        if raw_ocr_result
-                        else 0
+                        confidence_sum / detection_count if detection_count else 0.0
                     )
                     debug_session.save_json_data(
                         {
                             "total_detections": len(raw_ocr_result),
-                            "average_confidence": float(avg_confidence),
-                            "high_confidence_count": sum(
-                                1 for line in raw_ocr_result if line[1][1] > 0.9
-                            ),
-                            "low_confidence_count": sum(
-                                1 for line in raw_ocr_result if line[1][1] < 0.7
-                            ),
+                            "average_confidence": avg_confidence,
+                            "high_confidence_count": high_confidence_count,
+                            "low_confidence_count": low_confidence_count,
                             "total_characters": len(raw_ocr_text),
                             "croatian_special_chars": croatian_chars,
                             "text_lines": len(raw_text_lines),
@@ -393,57 +366,38 @@ class SimpleOCRPipeline:
                     )
 
                     logger.info(
-                        f"[SIMPLE PIPELINE] Saved OCR boxes and detailed text analysis to debug session"
+                        "[SIMPLE PIPELINE] Saved OCR boxes and detailed text analysis to debug session"
                     )
                 except Exception as e:
                     logger.error(
-                        f"[SIMPLE PIPELINE] Failed to save OCR debug data: {e}"
+                        "[SIMPLE PIPELINE] Failed to save OCR debug data: %s", e
                     )
 
-            # Create result
-            result = {
-                "success": True,
-                "processing_method": "simplified_single_mode",
-                "processing_time": processing_time,
-                "geometric_status": status,
-                "ocr_lines_count": len(text_lines),
-                "receipt": parsed_receipt,
-                "text_lines": text_lines,
-                "raw_text": raw_text,
-                "quality_metrics": {
-                    "ocr_score": quality_score,
-                    "quality_level": quality_level,
-                    "croatian_chars_detected": croatian_chars,
-                    "text_length": len(raw_text),
-                    "preprocessing_strategy": "optimal_gentle_otsu",
-                },
-                "metadata": {
-                    "workflow": "Raw Image -> Perfect Crop -> Simplified Preprocessing with Scoring -> Clean PaddleOCR -> Parser -> Results",
-                    "crop_accuracy_target": 98.0,
-                    "preprocessing_approach": "single_optimal_strategy_with_scoring",
-                    "fake_strategy_elimination": True,
-                    "scoring_system_integrated": True,
-                    "croatian_optimization": True,
-                    "enhanced_scoring": debug_utility,
-                    "debug_utility_enabled": debug_utility,
-                    "debug_session": debug_session.session_id
-                    if debug_session
-                    else None,
-                },
-            }
+            result = self._build_result(
+                processing_time,
+                status,
+                text_lines,
+                raw_text,
+                parsed_receipt,
+                quality_score,
+                quality_level,
+                croatian_chars,
+                debug_utility,
+                debug_session,
+            )
 
             # Finish debug session
             if debug_session:
                 self.debug_manager.finish_session(debug_session)
 
             logger.info(
-                f"[SIMPLE PIPELINE] SUCCESS! Processing completed in {processing_time:.2f}s"
+                "[SIMPLE PIPELINE] SUCCESS! Processing completed in %.2fs", processing_time
             )
             return result
 
         except Exception as e:
-            processing_time = time.time() - start_time
-            logger.error(f"[SIMPLE PIPELINE] ERROR after {processing_time:.2f}s: {e}")
+            processing_time = time.perf_counter() - start_time
+            logger.error("[SIMPLE PIPELINE] ERROR after %.2fs: %s", processing_time, e)
 
             # Log error to debug session
             if debug_session:
@@ -455,14 +409,335 @@ class SimpleOCRPipeline:
                 )
                 self.debug_manager.finish_session(debug_session)
 
+            return self._failure_result(e, processing_time, debug_session)
+
+    def _process_image_fast(
+        self,
+        image: "np.ndarray",
+        image_filename: str,
+        debug_utility: bool,
+        quick_mode: bool,
+        enable_parser_debug: bool,
+        start_time: float,
+    ) -> Dict[str, Any]:
+        """process_image without a debug session (the production path)"""
+        try:
+            logger.info("[SIMPLE PIPELINE] Starting processing: %s", image_filename)
+
+            logger.info("[SIMPLE PIPELINE] Step 1: Perfect geometric processing")
+            clean_cropped_image, status = self._crop(image)
+
+            logger.info(
+                "[SIMPLE PIPELINE] Step 2: OCR processing with integrated quality scoring"
+            )
+            from app.ocr.engines.paddle import run_ocr_on_image
+
+            ocr_results = run_ocr_on_image(
+                clean_cropped_image,
+                lang="hr",  # Croatian/Bosnian Latin script support
+                debug=self.debug,
+                auto_detect_country=True,  # Auto-detect and skip Croatian corrections for Bosnian
+            )
+            text_lines = self._extract_text_lines(ocr_results)
+            raw_text = "\n".join(text_lines)
+
+            if quick_mode and not debug_utility:
+                quality_score, quality_level, croatian_chars = NOT_SCORED
+            else:
+                quality_score, quality_level, croatian_chars = (
+                    self._score_text_quality(raw_text)
+                )
+
+            # Step 3: Parsing (skip if quick mode)
+            parsed_receipt = self._parse(
+                text_lines, raw_text, quick_mode, enable_parser_debug
+            )
+
+            processing_time = time.perf_counter() - start_time
+            result = self._build_result(
+                processing_time,
+                status,
+                text_lines,
+                raw_text,
+                parsed_receipt,
+                quality_score,
+                quality_level,
+                croatian_chars,
+                debug_utility,
+            )
+            logger.info(
+                "[SIMPLE PIPELINE] SUCCESS! Processing completed in %.2fs", processing_time
+            )
+            return result
+
+        except Exception as e:
+            processing_time = time.perf_counter() - start_time
+            logger.error("[SIMPLE PIPELINE] ERROR after %.2fs: %s", processing_time, e)
+            return self._failure_result(e, processing_time)
+
+    def _crop(self, image: "np.ndarray") -> Tuple["np.ndarray", str]:
+        """Geometric processing: (cropped receipt image, processor status)"""
+        processed_images, status, processing_info = (
+            self.geometric_processor.process_receipt(image)
+        )
+        if not processed_images:
+            raise ValueError(f"Geometric processing failed: {status}")
+
+        # Get the perfectly cropped, clean image
+        logger.info("[SIMPLE PIPELINE] Geometric processing: %s", status)
+        return processed_images[0], status
+
+    @staticmethod
+    def _extract_text_lines(ocr_results: List[Tuple[str, int, str]]) -> List[str]:
+        """Non-empty, stripped text lines of the OCR results (raises if there are none)"""
+        if not ocr_results:
+            raise ValueError("OCR processing returned no results")
+
+        # Extract text from OCR results (standard format)
+        # ocr_results is a list of tuples: [(full_text, config_index, config_name), ...]
+        # We need to split the full_text into individual lines for the parser
+        # (split("\n") rather than splitlines(), which also breaks on \r, \x0c, ...)
+        text_lines = [
+            stripped
+            for result in ocr_results
+            for line in result[0].split("\n")
+            if (stripped := line.strip())
+        ]
+
+        if not text_lines:
+            raise ValueError("OCR processing returned empty text")
+
+        logger.info(
+            "[SIMPLE PIPELINE] OCR extracted %d text lines using optimal strategy",
+            len(text_lines),
+        )
+        return text_lines
+
+    @staticmethod
+    def _score_text_quality(raw_text: str) -> Tuple[float, str, int]:
+        """OCR quality metrics: (quality score, quality level, Croatian character count)"""
+        # Calculate quality metrics using the scoring system
+        from app.ocr.engines.scoring.text_scoring import score_ocr_text
+
+        quality_score = score_ocr_text(raw_text)
+
+        # Determine quality level (a score equal to a threshold gets the higher level)
+        quality_level = QUALITY_LEVELS[bisect.bisect_right(QUALITY_THRESHOLDS, quality_score)]
+
+        # Count Croatian characters
+        croatian_chars = sum(map(raw_text.count, _CROATIAN_CHARS))
+
+        logger.info(
+            "[SIMPLE PIPELINE] OCR quality: %s (score: %.3f), Croatian chars detected: %d",
+            quality_level,
+            quality_score,
+            croatian_chars,
+        )
+        return quality_score, quality_level, croatian_chars
+
+    def _parse(
+        self,
+        text_lines: List[str],
+        raw_text: str,
+        quick_mode: bool,
+        enable_parser_debug: bool,
+        debug_session=None,
+    ) -> Dict[str, Any]:
+        """Parse the OCR text lines (placeholder receipt in quick mode)"""
+        if quick_mode:
+            logger.info("[SIMPLE PIPELINE] Step 3: Skipped (quick mode - OCR only)")
             return {
-                "success": False,
-                "error": str(e),
-                "processing_time": processing_time,
-                "processing_method": "simplified_single_mode_failed",
-                "debug_session": debug_session.session_id if debug_session else None,
+                "store": "Quick OCR Mode",
+                "items": [],
+                "total": None,
+                "raw_text": raw_text,
+                "text_lines": text_lines,
+                "quick_mode": True,
             }
 
+        logger.info("[SIMPLE PIPELINE] Step 3: Universal parsing")
+        if debug_session:
+            debug_session.capture_resource_snapshot("parsing_start")
+        parsed_receipt = self.parser.parse_receipt(
+            text_lines, log_debug=enable_parser_debug
+        )
+        if debug_session:
+            debug_session.capture_resource_snapshot("parsing_end")
+        return parsed_receipt
+
+    @staticmethod
+    def _build_result(
+        processing_time: float,
+        status: str,
+        text_lines: List[str],
+        raw_text: str,
+        parsed_receipt: Dict[str, Any],
+        quality_score: float,
+        quality_level: str,
+        croatian_chars: int,
+        debug_utility: bool = False,
+        debug_session=None,
+    ) -> Dict[str, Any]:
+        """Result dict of a successfully processed receipt"""
+        return {
+            "success": True,
+            "processing_method": "simplified_single_mode",
+            "processing_time": processing_time,
+            "geometric_status": status,
+            "ocr_lines_count": len(text_lines),
+            "receipt": parsed_receipt,
+            "text_lines": text_lines,
+            "raw_text": raw_text,
+            "quality_metrics": {
+                "ocr_score": quality_score,
+                "quality_level": quality_level,
+                "croatian_chars_detected": croatian_chars,
+                "text_length": len(raw_text),
+                "preprocessing_strategy": "optimal_gentle_otsu",
+            },
+            "metadata": {
+                "workflow": "Raw Image -> Perfect Crop -> Simplified Preprocessing with Scoring -> Clean PaddleOCR -> Parser -> Results",
+                "crop_accuracy_target": 98.0,
+                "preprocessing_approach": "single_optimal_strategy_with_scoring",
+                "fake_strategy_elimination": True,
+                "scoring_system_integrated": True,
+                "croatian_optimization": True,
+                "enhanced_scoring": debug_utility,
+                "debug_utility_enabled": debug_utility,
+                "debug_session": debug_session.session_id
+                if debug_session
+                else None,
+            },
+        }
+
+    @staticmethod
+    def _failure_result(
+        error: Exception, processing_time: float, debug_session=None
+    ) -> Dict[str, Any]:
+        """Result dict of a receipt that failed to process"""
+        return {
+            "success": False,
+            "error": str(error),
+            "processing_time": processing_time,
+            "processing_method": "simplified_single_mode_failed",
+            "debug_session": debug_session.session_id if debug_session else None,
+        }
+
+    def process_batch(
+        self,
+        images: List["np.ndarray"],
+        quick_mode: bool = False,
+        enable_parser_debug: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several receipt images with the pipeline stages overlapped.
+
+        Geometric processing, OCR and parsing run in their own threads connected
+        by bounded queues, so the crop of image N+1 runs while image N is in OCR
+        and image N-1 is being parsed. Each image goes through the same steps as
+        process_image (without debug sessions).
+
+        Args:
+            images: Input receipt images
+            quick_mode: Skip parser, only do OCR
+            enable_parser_debug: Enable detailed parser debugging
+
+        Returns:
+            One process_image style result dict per image, in input order
+        """
+        from app.ocr.engines.paddle import run_ocr_on_image
+
+        results: Dict[int, Dict[str, Any]] = {}
+        to_ocr: queue.Queue = queue.Queue(maxsize=BATCH_QUEUE_SIZE)
+        to_parse: queue.Queue = queue.Queue(maxsize=BATCH_QUEUE_SIZE)
+
+        def fail(job_id: int, start_time: float, error: Exception):
+            processing_time = time.perf_counter() - start_time
+            logger.error(
+                "[SIMPLE PIPELINE] Batch image %d failed after %.2fs: %s",
+                job_id,
+                processing_time,
+                error,
+            )
+            results[job_id] = self._failure_result(error, processing_time)
+
+        def geometric_stage():
+            try:
+                for job_id, image in enumerate(images):
+                    start_time = time.perf_counter()
+                    try:
+                        cropped, status = self._crop(image)
+                    except Exception as e:
+                        fail(job_id, start_time, e)
+                        continue
+                    to_ocr.put((job_id, start_time, (cropped, status)))
+            finally:
+                to_ocr.put(None)
+
+        def ocr_stage():
+            try:
+                while True:
+                    job = to_ocr.get()
+                    if job is None:
+                        break
+                    job_id, start_time, (cropped, status) = job
+                    try:
+                        ocr_results = run_ocr_on_image(
+                            cropped,
+                            lang="hr",
+                            debug=self.debug,
+                            auto_detect_country=True,
+                        )
+                        text_lines = self._extract_text_lines(ocr_results)
+                    except Exception as e:
+                        fail(job_id, start_time, e)
+                        continue
+                    to_parse.put((job_id, start_time, (status, text_lines)))
+            finally:
+                to_parse.put(None)
+
+        logger.info("[SIMPLE PIPELINE] Processing batch of %d images", len(images))
+        stages = [
+            threading.Thread(target=geometric_stage, name="ocr-batch-geometric", daemon=True),
+            threading.Thread(target=ocr_stage, name="ocr-batch-ocr", daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+
+        # Parsing stage runs in the calling thread
+        while True:
+            job = to_parse.get()
+            if job is None:
+                break
+            job_id, start_time, (status, text_lines) = job
+            try:
+                raw_text = "\n".join(text_lines)
+                if quick_mode:
+                    quality_score, quality_level, croatian_chars = NOT_SCORED
+                else:
+                    quality_score, quality_level, croatian_chars = (
+                        self._score_text_quality(raw_text)
+                    )
+                parsed_receipt = self._parse(
+                    text_lines, raw_text, quick_mode, enable_parser_debug
+                )
+                results[job_id] = self._build_result(
+                    time.perf_counter() - start_time,
+                    status,
+                    text_lines,
+                    raw_text,
+                    parsed_receipt,
+                    quality_score,
+                    quality_level,
+                    croatian_chars,
+                )
+            except Exception as e:
+                fail(job_id, start_time, e)
+
+        for stage in stages:
+            stage.join()
+        return [results[job_id] for job_id in range(len(images))]
+
     def process_single_receipt(
         self, image_path: str, endpoint: str = "ocr", image_filename: str = None
     ) -> Dict[str, Any]:
@@ -478,17 +753,16 @@ class SimpleOCRPipeline:
             Dict containing parsed receipt data and metadata
         """
         try:
-            # Load image from file
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ValueError(f"Could not load image: {image_path}")
+            image, decode_scale = self._load_image_file(image_path)
 
             # Extract filename if not provided
             if image_filename is None:
                 image_filename = os.path.basename(image_path)
 
             logger.info(
-                f"[SIMPLE PIPELINE] Processing file: {image_path} for endpoint: {endpoint}"
+                "[SIMPLE PIPELINE] Processing file: %s for endpoint: %s",
+                image_path,
+                endpoint,
             )
 
             # Process using the main image processing method
@@ -498,12 +772,13 @@ class SimpleOCRPipeline:
             if "metadata" in result:
                 result["metadata"]["endpoint"] = endpoint
                 result["metadata"]["source_file"] = image_path
+                result["metadata"]["decode_scale"] = decode_scale
 
             return result
 
         except Exception as e:
             logger.error(
-                f"[SIMPLE PIPELINE] File processing error for {image_path}: {e}"
+                "[SIMPLE PIPELINE] File processing error for %s: %s", image_path, e
             )
             return {
                 "success": False,
@@ -513,6 +788,82 @@ class SimpleOCRPipeline:
                 "endpoint": endpoint,
             }
 
+    def process_batch_files(
+        self,
+        image_paths: List[str],
+        quick_mode: bool = False,
+        enable_parser_debug: bool = False,
+        max_workers: int = MAX_DECODE_WORKERS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several receipt files, decoding them in parallel.
+
+        Files are decoded by a thread pool (OpenCV releases the GIL while
+        decoding), then the loaded images go through process_batch, which
+        keeps a single OCR stage on the shared engine.
+
+        Args:
+            image_paths: Paths to the receipt image files
+            quick_mode: Skip parser, only do OCR
+            enable_parser_debug: Enable detailed parser debugging
+            max_workers: Threads used for decoding
+
+        Returns:
+            One process_single_receipt style result dict per file, in input order
+        """
+
+        def load(image_path: str):
+            try:
+                return self._load_image_file(image_path)
+            except Exception as e:
+                return e, None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            loaded = list(executor.map(load, image_paths))
+
+        results: List[Dict[str, Any]] = [None] * len(image_paths)
+        batch_ids = []
+        for file_id, (image_path, (image, _)) in enumerate(zip(image_paths, loaded, strict=True)):
+            if isinstance(image, Exception):
+                logger.error(
+                    "[SIMPLE PIPELINE] File processing error for %s: %s", image_path, image
+                )
+                results[file_id] = {
+                    "success": False,
+                    "error": f"File processing failed: {str(image)}",
+                    "processing_method": "simplified_single_mode_file_failed",
+                    "source_file": image_path,
+                }
+            else:
+                batch_ids.append(file_id)
+
+        batch_results = self.process_batch(
+            [loaded[file_id][0] for file_id in batch_ids], quick_mode, enable_parser_debug
+        )
+        for file_id, result in zip(batch_ids, batch_results, strict=True):
+            if "metadata" in result:
+                result["metadata"]["source_file"] = image_paths[file_id]
+                result["metadata"]["decode_scale"] = loaded[file_id][1]
+            results[file_id] = result
+        return results
+
+    @staticmethod
+    def _load_image_file(image_path: str) -> Tuple["np.ndarray", int]:
+        """Decode an image file: (image, decode scale)"""
+        import cv2
+
+        # Large photos are downscaled while decoding, which is much cheaper
+        # than a full decode followed by a resize
+        decode_scale = 1
+        if os.path.getsize(image_path) > REDUCED_DECODE_MIN_BYTES:
+            decode_scale = 2
+            image = cv2.imread(image_path, cv2.IMREAD_REDUCED_COLOR_2)
+        else:
+            image = cv2.imread(image_path)
+        if image is None:
+            raise ValueError(f"Could not load image: {image_path}")
+        return image, decode_scale
+
     def get_processing_info(self) -> Dict[str, Any]:
         """Get information about the simplified pipeline."""
         return {
@@ -537,6 +888,28 @@ class SimpleOCRPipeline:
         }
 
 
+# Pipelines built so far, keyed by debug flag
+_PIPELINE_CACHE: Dict[bool, SimpleOCRPipeline] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def get_pipeline(debug: bool = True) -> SimpleOCRPipeline:
+    """
+    Get the shared SimpleOCRPipeline for this configuration, building it on first use.
+
+    Constructing a pipeline sets up the processor, parser and preprocessor, so
+    request handlers should use this instead of instantiating SimpleOCRPipeline.
+    """
+    pipeline = _PIPELINE_CACHE.get(debug)
+    if pipeline is None:
+        with _CACHE_LOCK:
+            pipeline = _PIPELINE_CACHE.get(debug)
+            if pipeline is None:
+                pipeline = SimpleOCRPipeline(debug=debug)
+                _PIPELINE_CACHE[debug] = pipeline
+    return pipeline
+
+
 # Backward compatibility alias
 UnifiedOCRPipeline = SimpleOCRPipeline
 
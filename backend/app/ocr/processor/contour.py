@@ -8,12 +8,19 @@ import cv2
 import numpy as np
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from app.ocr.engines.scoring.contour_scoring import score_receipt_contour
 from app.core.constants import DEBUG_IMAGE_DIR, DEBUG_SAVE_FILES
 from .contour_methods import BinaryContourMethods, FallbackContourDetection, ContourValidator
+from .contour_methods.binary_methods import CONTOUR_WORKERS
 
 logger = logging.getLogger(__name__)
 
+# Contours are searched on a copy scaled down to this long edge (the receipt
+# covers >8% of the frame, so its outline survives; every pass is O(pixels)).
+# At 1024 the corners mapped back to a 12 MP frame drifted by up to ~35px
+CONTOUR_SEARCH_MAX_EDGE = 1536
+
 
 class ReceiptContourDetector:
     """Main receipt contour detector using multiple strategies"""
@@ -49,52 +56,86 @@ class ReceiptContourDetector:
         h, w = img.shape[:2]
         logger.info(f"[CONTOUR] Processing image {w}x{h}")
         
-        # Strategy 1: Try multiple binary methods
-        binary_methods, gray_image = self.binary_methods.create_binary_methods(img)
+        # Search on a downscaled copy, the found contour is mapped back to img
+        scale = min(1.0, CONTOUR_SEARCH_MAX_EDGE / max(h, w))
+        search_img = img
+        if scale < 1.0:
+            search_img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            logger.debug("[CONTOUR] Searching on %dx%d copy", search_img.shape[1], search_img.shape[0])
+        
+        # Grayscale once - both strategies work on (and accept) the gray image
+        gray_image = cv2.cvtColor(search_img, cv2.COLOR_BGR2GRAY) if len(search_img.shape) == 3 else search_img
         self._current_gray_image = gray_image
         
-        best_contour = self.find_best_contour(binary_methods, img)
+        # Strategy 1: Try multiple binary methods
+        binary_methods, _ = self.binary_methods.create_binary_methods(gray_image)
+        
+        best_contour = self.find_best_contour(binary_methods, search_img)
         
         if best_contour is not None:
             logger.info("[CONTOUR] Found contour using binary methods")
-            return best_contour
+            return self._to_image_scale(best_contour, scale, (h, w))
         
         # Strategy 2: Enhanced fallback detection
         logger.info("[CONTOUR] Binary methods failed, trying fallback")
-        fallback_contour = self.fallback_detection.enhanced_fallback_detection(img)
+        fallback_contour = self.fallback_detection.enhanced_fallback_detection(gray_image)
         
         if fallback_contour is not None:
             logger.info("[CONTOUR] Found contour using fallback method")
-            return fallback_contour
+            return self._to_image_scale(fallback_contour, scale, (h, w))
         
         logger.warning("[CONTOUR] All detection methods failed")
         return None
     
+    @staticmethod
+    def _to_image_scale(contour, scale, image_shape):
+        """Map a contour found on the downscaled search copy back to the full image"""
+        if scale == 1.0:
+            return contour
+        h, w = image_shape
+        points = np.rint(contour.astype(np.float64) / scale)
+        points[..., 0] = np.clip(points[..., 0], 0, w - 1)
+        points[..., 1] = np.clip(points[..., 1], 0, h - 1)
+        return points.astype(np.int32)
+    
     def find_best_contour(self, binary_methods, original_image):
         """Find the best contour from multiple binary processing methods"""
         h, w = original_image.shape[:2]
         image_area = w * h
+        min_area = image_area * 0.08  # Reduced from 0.15 to catch smaller receipts
+        # Scratch buffer for the whiteness masks, reused by every candidate
+        mask_buffer = np.empty((h, w), np.uint8)
         
         best_contour = None
         best_score = -1
         best_method = None
         
-        for method_name, binary_image in binary_methods:
-            logger.debug(f"[CONTOUR] Testing method: {method_name}")
+        # Find contours in every binary image (independent, GIL-free OpenCV calls)
+        def find_contours(method):
+            return cv2.findContours(method[1], cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]
+        
+        if CONTOUR_WORKERS > 1:
+            with ThreadPoolExecutor(max_workers=CONTOUR_WORKERS) as executor:
+                method_contours = list(executor.map(find_contours, binary_methods))
+        else:
+            method_contours = [find_contours(method) for method in binary_methods]
+        
+        for (method_name, binary_image), contours in zip(binary_methods, method_contours, strict=True):
+            logger.debug("[CONTOUR] Testing method: %s", method_name)
             self.save_debug_image(binary_image, f"contour_gentle_{method_name}.png")
             
-            # Find contours in this binary image
-            contours, _ = cv2.findContours(binary_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
             if not contours:
                 continue
             
             # Test each contour
             for contour in contours:
-                area = cv2.contourArea(contour)
-
                 # Must be substantial (more lenient for finger-held receipts and small receipts in large images)
-                if area < image_area * 0.08:  # Reduced from 0.15 to catch smaller receipts
+                # The bounding box bounds the area from above, so small noise is dropped before contourArea
+                _, _, box_w, box_h = cv2.boundingRect(contour)
+                if box_w * box_h < min_area:
+                    continue
+                area = cv2.contourArea(contour)
+                if area < min_area:
                     continue
 
                 # Convert to rectangle
@@ -103,9 +144,14 @@ class ReceiptContourDetector:
                 # CRITICAL FIX: Check whiteness BEFORE other validation
                 # Reject dark contours (table edges, wood grain, shadows, background)
                 if self._current_gray_image is not None:
-                    mask = np.zeros((h, w), np.uint8)
-                    cv2.drawContours(mask, [rect_contour], -1, (255,), -1)
-                    mean_intensity = cv2.mean(self._current_gray_image, mask=mask)[0]
+                    # Mask only the contour's bounding box instead of the whole image
+                    x, y, box_w, box_h = cv2.boundingRect(rect_contour)
+                    x0, y0 = max(x, 0), max(y, 0)
+                    x1, y1 = min(x + box_w, w), min(y + box_h, h)
+                    mask = mask_buffer[:max(y1 - y0, 0), :max(x1 - x0, 0)]
+                    mask.fill(0)
+                    cv2.drawContours(mask, [rect_contour], -1, (255,), -1, offset=(-x0, -y0))
+                    mean_intensity = cv2.mean(self._current_gray_image[y0:y1, x0:x1], mask=mask)[0]
                 else:
                     # Fallback if gray image not available
                     mean_intensity = 200  # Assume white
@@ -113,17 +159,18 @@ class ReceiptContourDetector:
                 # Receipts are WHITE paper - reject anything that's not predominantly white
                 # This fixes the wood grain / table detection issue
                 if mean_intensity < 140:  # Dark contours = table/background, not receipt
-                    logger.debug(f"[CONTOUR] Rejecting dark contour (brightness={mean_intensity:.0f} < 140)")
+                    logger.debug("[CONTOUR] Rejecting dark contour (brightness=%.0f < 140)", mean_intensity)
                     continue
 
                 # Validate the contour
                 if not self.validator.validate_full_receipt_contour(rect_contour, (h, w)):
                     continue
 
-                # Score this contour
-                score = self.score_full_receipt_contour(rect_contour, image_area, (h, w))
+                # Score this contour (reusing the brightness measured above)
+                score = self.score_full_receipt_contour(rect_contour, image_area, (h, w), mean_intensity)
 
-                logger.debug(f"[CONTOUR] Method {method_name}: area={area}, brightness={mean_intensity:.0f}, score={score}")
+                logger.debug("[CONTOUR] Method %s: area=%s, brightness=%.0f, score=%s",
+                             method_name, area, mean_intensity, score)
 
                 if score > best_score:
                     best_score = score
@@ -141,9 +188,9 @@ class ReceiptContourDetector:
         
         return best_contour
     
-    def score_full_receipt_contour(self, contour, image_area, image_shape):
+    def score_full_receipt_contour(self, contour, image_area, image_shape, mean_intensity=None):
         """Score a contour for receipt detection quality"""
-        return score_receipt_contour(contour, image_area, image_shape, self._current_gray_image)
+        return score_receipt_contour(contour, image_area, image_shape, self._current_gray_image, mean_intensity)
     
     def draw_points(self, img, pts, color=(0, 0, 255)):
         """Draw points on image for debugging"""
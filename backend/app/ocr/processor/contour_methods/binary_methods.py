@@ -5,11 +5,21 @@ Different approaches to create binary images for contour detection.
 """
 
 import cv2
-import numpy as np
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from .gray_stats import gray_histogram, histogram_mean, histogram_percentile
 
 logger = logging.getLogger(__name__)
 
+# Structuring elements shared by every call (cv2 only reads them)
+_KERNEL_2X2 = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+_KERNEL_3X3 = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # Same as np.ones((3, 3), np.uint8)
+_KERNEL_5X5 = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+
+# Threads running the binary methods (and their findContours) side by side
+CONTOUR_WORKERS = min(6, os.cpu_count() or 1)
+
 
 class BinaryContourMethods:
     """Handles creation of various binary images for contour detection"""
@@ -24,44 +34,42 @@ class BinaryContourMethods:
         # CRITICAL: Much gentler filtering to preserve edges near fingers
         filtered = cv2.GaussianBlur(gray, (3, 3), 0)  # Much lighter blur
         
-        methods = []
-        
-        # Method 1: GENTLE Otsu (works better with fingers)
-        _, gentle_otsu = cv2.threshold(filtered, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        methods.append(("gentle_otsu", gentle_otsu))
-        
-        # Method 2: HIGH threshold binary (fingers are usually darker than receipt)
-        high_thresh = int(np.percentile(filtered, 75))  # Use 75th percentile as threshold
-        _, high_binary = cv2.threshold(filtered, high_thresh, 255, cv2.THRESH_BINARY)
-        methods.append(("high_threshold", high_binary))
-        
-        # Method 3: VERY gentle adaptive (large block size to ignore finger details)
-        adaptive_gentle = cv2.adaptiveThreshold(filtered, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                               cv2.THRESH_BINARY, 31, 15)  # Large block, gentle
-        methods.append(("adaptive_gentle", adaptive_gentle))
-        
-        # Method 4: Multiple Otsu thresholds to separate finger/receipt/background
-        mean_val = int(np.mean(filtered))
-        
-        _, mean_plus = cv2.threshold(filtered, mean_val + 20, 255, cv2.THRESH_BINARY)
-        methods.append(("mean_plus", mean_plus))
-        
-        _, mean_minus = cv2.threshold(filtered, mean_val - 20, 255, cv2.THRESH_BINARY)
-        methods.append(("mean_minus", mean_minus))
-        
-        # Method 5: Edge-based but MUCH gentler
-        edges_gentle = cv2.Canny(filtered, 30, 90)  # Lower thresholds
-        kernel_small = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # Smaller kernel
-        edges_dilated = cv2.dilate(edges_gentle, kernel_small, iterations=1)
-        methods.append(("gentle_edges", edges_dilated))
-        
-        # CRITICAL: Only light morphological operations
-        cleaned_methods = []
-        for name, binary in methods:
+        # Threshold statistics come from one histogram instead of sorting all pixels
+        hist = gray_histogram(filtered)
+        high_thresh = int(histogram_percentile(hist, 75))  # Use 75th percentile as threshold
+        mean_val = int(histogram_mean(hist))
+        
+        def gentle_edges():
+            edges_gentle = cv2.Canny(filtered, 30, 90)  # Lower thresholds
+            return cv2.dilate(edges_gentle, _KERNEL_3X3, iterations=1)  # Smaller kernel
+        
+        methods = [
+            # Method 1: GENTLE Otsu (works better with fingers)
+            ("gentle_otsu", lambda: cv2.threshold(filtered, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]),
+            # Method 2: HIGH threshold binary (fingers are usually darker than receipt)
+            ("high_threshold", lambda: cv2.threshold(filtered, high_thresh, 255, cv2.THRESH_BINARY)[1]),
+            # Method 3: VERY gentle adaptive (large block size to ignore finger details)
+            ("adaptive_gentle", lambda: cv2.adaptiveThreshold(filtered, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                                              cv2.THRESH_BINARY, 31, 15)),  # Large block, gentle
+            # Method 4: Multiple Otsu thresholds to separate finger/receipt/background
+            ("mean_plus", lambda: cv2.threshold(filtered, mean_val + 20, 255, cv2.THRESH_BINARY)[1]),
+            ("mean_minus", lambda: cv2.threshold(filtered, mean_val - 20, 255, cv2.THRESH_BINARY)[1]),
+            # Method 5: Edge-based but MUCH gentler
+            ("gentle_edges", gentle_edges),
+        ]
+        
+        def build(method):
+            name, make_binary = method
+            # CRITICAL: Only light morphological operations
             # MINIMAL morphological operations - don't destroy finger boundaries
-            kernel_tiny = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-            cleaned = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel_tiny, iterations=1)
-            cleaned_methods.append((name, cleaned))
+            return name, cv2.morphologyEx(make_binary(), cv2.MORPH_CLOSE, _KERNEL_2X2, iterations=1)
+        
+        # The methods are independent OpenCV passes (which release the GIL)
+        if CONTOUR_WORKERS > 1:
+            with ThreadPoolExecutor(max_workers=CONTOUR_WORKERS) as executor:
+                cleaned_methods = list(executor.map(build, methods))
+        else:
+            cleaned_methods = [build(method) for method in methods]
         
         return cleaned_methods, gray
     
@@ -71,9 +79,8 @@ class BinaryContourMethods:
         blurred = cv2.GaussianBlur(img, (5, 5), 0)
         
         # Apply dilate and erode to close small gaps
-        kernel = np.ones((3, 3), np.uint8)
-        dilated = cv2.dilate(blurred, kernel, iterations=2)
-        closed = cv2.morphologyEx(dilated, cv2.MORPH_CLOSE, kernel, iterations=2)
+        dilated = cv2.dilate(blurred, _KERNEL_3X3, iterations=2)
+        closed = cv2.morphologyEx(dilated, cv2.MORPH_CLOSE, _KERNEL_3X3, iterations=2)
         
         # Edge detection
         edged = cv2.Canny(closed, 50, 150, apertureSize=3)
@@ -83,12 +90,10 @@ class BinaryContourMethods:
     def binarize(self, edged):
         """Convert edge image to binary with morphological operations"""
         # Apply morphological operations to fill gaps
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
-        
         # Dilate to make edges thicker
-        dilated = cv2.dilate(edged, kernel, iterations=2)
+        dilated = cv2.dilate(edged, _KERNEL_5X5, iterations=2)
         
         # Close gaps
-        closed = cv2.morphologyEx(dilated, cv2.MORPH_CLOSE, kernel, iterations=3)
+        closed = cv2.morphologyEx(dilated, cv2.MORPH_CLOSE, _KERNEL_5X5, iterations=3)
         
         return closed
\ No newline at end of file
@@ -29,7 +29,7 @@ class ContourValidator:
         area_ratio = area / image_area
 
         if not (0.1 <= area_ratio <= 0.95):  # Allow smaller receipts (was 0.2-0.9)
-            logger.debug(f"[VALIDATE] Area ratio {area_ratio:.3f} out of range (0.1-0.95)")
+            logger.debug("[VALIDATE] Area ratio %.3f out of range (0.1-0.95)", area_ratio)
             return False
         
         # Check aspect ratio
@@ -37,7 +37,7 @@ class ContourValidator:
         aspect_ratio = h / w if w > 0 else 0
         
         if not (1.0 <= aspect_ratio <= 5.0):  # Must be reasonable
-            logger.debug(f"[VALIDATE] Aspect ratio {aspect_ratio:.2f} out of range")
+            logger.debug("[VALIDATE] Aspect ratio %.2f out of range", aspect_ratio)
             return False
         
         return True
@@ -62,22 +62,12 @@ class ContourValidator:
     
     def order_points(self, pts):
         """Order points in clockwise order starting from top-left"""
-        # Sort the points based on their x-coordinates
-        xSorted = pts[np.argsort(pts[:, 0]), :]
-        
-        # Grab the left-most and right-most points from the sorted x-coordinate points
-        leftMost = xSorted[:2, :]
-        rightMost = xSorted[2:, :]
-        
-        # Now, sort the left-most coordinates according to their y-coordinates
-        # to grab the top-left and bottom-left points
-        leftMost = leftMost[np.argsort(leftMost[:, 1]), :]
-        (tl, bl) = leftMost
-        
-        # Sort the right-most coordinates according to their y-coordinates
-        # to grab the top-right and bottom-right points  
-        rightMost = rightMost[np.argsort(rightMost[:, 1]), :]
-        (tr, br) = rightMost
+        # Sum and difference method, as in the cropping validators:
+        # top-left has the smallest x + y, bottom-right the largest,
+        # top-right the smallest y - x and bottom-left the largest
+        s = pts.sum(axis=1)
+        diff = np.diff(pts, axis=1).ravel()
         
         # Return the coordinates in top-left, top-right, bottom-right, and bottom-left order
-        return np.array([tl, tr, br, bl], dtype="float32")
\ No newline at end of file
+        return np.array([pts[np.argmin(s)], pts[np.argmin(diff)], pts[np.argmax(s)], pts[np.argmax(diff)]],
+                        dtype="float32")
\ No newline at end of file
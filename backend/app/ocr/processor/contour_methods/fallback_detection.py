@@ -7,9 +7,13 @@ Enhanced fallback methods for receipt detection when standard methods fail.
 import cv2
 import numpy as np
 import logging
+from .gray_stats import gray_histogram, histogram_percentile
 
 logger = logging.getLogger(__name__)
 
+# Structuring element for connecting edge gaps (shared, cv2 only reads it)
+_KERNEL_5X5 = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+
 
 class FallbackContourDetection:
     """Enhanced fallback for full receipt detection"""
@@ -28,7 +32,7 @@ class FallbackContourDetection:
         # Assume receipt is the brightest part of the image
         
         # Create mask for bright areas
-        bright_thresh = int(np.percentile(gray, 85))  # Top 15% of brightness
+        bright_thresh = int(histogram_percentile(gray_histogram(gray), 85))  # Top 15% of brightness
         _, bright_mask = cv2.threshold(gray, bright_thresh, 255, cv2.THRESH_BINARY)
         
         # Find the largest bright contour
@@ -54,8 +58,7 @@ class FallbackContourDetection:
         edges = cv2.Canny(blurred, 20, 100)
         
         # Dilate edges to connect gaps
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
-        dilated = cv2.dilate(edges, kernel, iterations=3)
+        dilated = cv2.dilate(edges, _KERNEL_5X5, iterations=3)
         
         # Find contours
         contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -98,11 +101,15 @@ class FallbackContourDetection:
         best_contour = None
         best_area = 0
         
+        min_area = image_area * min_area_ratio
+        
         for contour in contours:
+            # Must be significant size (the bounding box rules out small noise cheaply)
+            _, _, box_w, box_h = cv2.boundingRect(contour)
+            if box_w * box_h < min_area:
+                continue
             area = cv2.contourArea(contour)
-            
-            # Must be significant size
-            if area < image_area * min_area_ratio:
+            if area < min_area:
                 continue
             
             # Try to approximate as rectangle
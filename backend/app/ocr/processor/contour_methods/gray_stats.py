@@ -0,0 +1,36 @@
+"""
+Grayscale Image Statistics
+==========================
+Percentile and mean of uint8 images computed from a 256-bin histogram.
+
+cv2.calcHist makes one vectorized pass over the image; the statistics are
+then read from the 256 bins instead of sorting every pixel (np.percentile).
+Results match np.percentile (linear interpolation) and np.mean.
+"""
+
+import cv2
+import numpy as np
+
+_LEVELS = np.arange(256, dtype=np.float64)
+
+
+def gray_histogram(gray):
+    """Pixel count per gray level (0-255) of a uint8 image"""
+    return cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel().astype(np.int64)
+
+
+def histogram_percentile(hist, q):
+    """q-th percentile (0-100) of the pixels counted in hist, as np.percentile"""
+    cdf = np.cumsum(hist)
+    count = int(cdf[-1])
+    position = q / 100 * (count - 1)
+    lower = int(position)
+    # Gray level of the pixels at sorted positions lower and lower + 1
+    low_value = int(np.searchsorted(cdf, lower, side="right"))
+    high_value = int(np.searchsorted(cdf, min(lower + 1, count - 1), side="right"))
+    return low_value + (position - lower) * (high_value - low_value)
+
+
+def histogram_mean(hist):
+    """Mean gray level of the pixels counted in hist"""
+    return float(hist @ _LEVELS) / hist.sum()
@@ -100,10 +100,16 @@ class ReceiptProcessor:
         """Legacy method - now redirects to dedicated cropper"""
         return self.cropper.order_points(pts)
 
-    def process_receipt(self, image):
+    def process_receipt(self, image, debug=None):
         """
         Main processing pipeline using improved contour detection
+
+        Returns (processed_images, status, processing_info). processing_info is
+        only collected when debug is on (defaults to self.debug), otherwise None.
         """
+        if debug is None:
+            debug = self.debug
+
         logger.info("[PROCESSOR] Starting receipt processing with improved contour detection")
 
         try:
@@ -164,7 +170,7 @@ class ReceiptProcessor:
                 logger.info("[PROCESSOR] Fallback mode - processing full image")
 
             logger.info(f"[PROCESSOR] Complete: {status}, {len(processed_images)} images ready for OCR")
-            return processed_images, status, {}
+            return processed_images, status, ({} if debug else None)
 
         except Exception as e:
             logger.error(f"[PROCESSOR] Error: {e}")
@@ -172,6 +178,6 @@ class ReceiptProcessor:
             # Final fallback
             try:
                 gray = image if len(image.shape) == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                return [gray], "error_fallback", {"error": str(e)}
+                return [gray], "error_fallback", ({"error": str(e)} if debug else None)
             except:
-                return [image], "complete_failure", {"error": str(e)}
\ No newline at end of file
+                return [image], "complete_failure", ({"error": str(e)} if debug else None)
\ No newline at end of file
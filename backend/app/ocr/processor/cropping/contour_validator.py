@@ -30,7 +30,7 @@ class CroppingContourValidator:
         # Check if points form a reasonable quadrilateral
         area = cv2.contourArea(contour)
         if area < 10000:  # Minimum area threshold
-            logger.debug(f"[CROP VALIDATE] Contour area too small: {area}")
+            logger.debug("[CROP VALIDATE] Contour area too small: %s", area)
             return False
         
         return True
@@ -63,7 +63,7 @@ class CroppingContourValidator:
         # Order points properly: TL, TR, BR, BL
         ordered_points = self.order_points(points)
         
-        logger.debug(f"[CROP PREP] Prepared contour with points: {ordered_points}")
+        logger.debug("[CROP PREP] Prepared contour with points: %s", ordered_points)
         return ordered_points.reshape(4, 1, 2).astype(np.int32)
     
     def order_points(self, pts):
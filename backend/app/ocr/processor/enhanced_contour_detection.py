@@ -29,6 +29,11 @@ from app.core.constants import DEBUG_SAVE_FILES
 
 logger = logging.getLogger(__name__)
 
+# Structuring elements shared by every call (cv2 only reads them)
+_KERNEL_3X3 = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # Same as np.ones((3, 3), np.uint8)
+_KERNEL_5X5 = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+_KERNEL_10X10 = cv2.getStructuringElement(cv2.MORPH_RECT, (10, 10))
+
 
 @dataclass
 class ContourResult:
@@ -175,13 +180,11 @@ class EnhancedContourDetector:
 
             # MORPHOLOGICAL FILTERING to remove small grains and focus on main shapes
             # Remove small noise with opening operation
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
-            binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, iterations=2)
+            binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, _KERNEL_5X5, iterations=2)
             self.save_debug_image(binary, "04_otsu_morph_open.png")
 
             # Fill gaps in main shapes with closing operation
-            kernel_large = cv2.getStructuringElement(cv2.MORPH_RECT, (10, 10))
-            binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel_large, iterations=1)
+            binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, _KERNEL_10X10, iterations=1)
             self.save_debug_image(binary, "05_otsu_morph_close.png")
 
             # Find contours - use RETR_LIST to get all contours, not just external
@@ -274,8 +277,7 @@ class EnhancedContourDetector:
             edges = cv2.Canny(blurred, 50, 150, apertureSize=3)
 
             # Morphological operations to connect edges
-            kernel = np.ones((3, 3), np.uint8)
-            edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
+            edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, _KERNEL_3X3)
 
             # Find contours
             contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -299,11 +301,9 @@ class EnhancedContourDetector:
             _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
 
             # Morphological operations to repair broken edges
-            kernel_close = np.ones((5, 5), np.uint8)
-            binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel_close)
+            binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, _KERNEL_5X5)
 
-            kernel_open = np.ones((3, 3), np.uint8)
-            binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel_open)
+            binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, _KERNEL_3X3)
 
             # Find contours
             contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -489,8 +489,8 @@ class EnhancedContourDetector:
         # Return the highest confidence result that meets minimum threshold
         for result in results:
             if result.confidence >= 0.5:  # Minimum confidence threshold
-                self.logger.debug(f"[ENHANCED CONTOUR] Selected {result.method} "
-                                f"(confidence: {result.confidence:.3f})")
+                self.logger.debug("[ENHANCED CONTOUR] Selected %s (confidence: %.3f)",
+                                  result.method, result.confidence)
                 return result
 
         # If no result meets threshold, return the best available
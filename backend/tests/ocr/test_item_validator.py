@@ -0,0 +1,25 @@
+import copy
+
+from app.ocr.parsing.validators.item_validator import ItemValidator
+
+ITEMS = [
+    {"name": "Kava s mlijekom", "quantity": 2, "price_per_item": 1.0, "total": 3.0},
+    {"name": "UKUPNO", "quantity": 1, "price_per_item": 9.4, "total": 9.4},
+    {"name": "Sok", "quantity": 1, "price_per_item": 2.5, "total": 2.5},
+    {"name": "X", "quantity": 3, "price_per_item": 1.0, "total": 4.5},
+    {"name": "Kroasan", "quantity": 4, "price_per_item": 1.2, "total": 3.9},
+    {"name": "Voda", "price": 1.5, "total": 1.5},
+]
+
+
+def test_validate_and_score_matches_separate_calls() -> None:
+    validator = ItemValidator()
+    for expected_total in (9.4, None):
+        valid = validator.validate_and_clean_items(copy.deepcopy(ITEMS), expected_total)
+        expected = (valid, validator.calculate_items_confidence(valid, expected_total))
+
+        result = validator.validate_and_score(copy.deepcopy(ITEMS), expected_total)
+
+        assert result == expected
+        # The math check corrected the first item's price before scoring
+        assert result[0][0]["price_per_item"] == 1.5
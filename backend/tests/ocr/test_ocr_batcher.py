@@ -0,0 +1,120 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.ocr.engines.paddle.ocr_batcher import OCRBatcher
+
+BAD_VALUE = 99
+
+
+class StubEngine:
+    """Engine stand-in: records each predict call's batch size"""
+
+    def __init__(self, fail_batches: bool = False) -> None:
+        self.calls: list[int] = []
+        self.fail_batches = fail_batches
+        self.first_call = threading.Event()
+        self.release = threading.Event()
+        self.ocr = SimpleNamespace(predict=self._predict)
+
+    def _predict(self, images: list[np.ndarray]) -> list[dict[str, int]]:
+        self.calls.append(len(images))
+        if len(self.calls) == 1:
+            # Hold the worker on its first call so later requests queue up
+            self.first_call.set()
+            self.release.wait(5)
+        if self.fail_batches and len(images) > 1:
+            raise RuntimeError("batched predict failed")
+        values = [int(image[0, 0]) for image in images]
+        if BAD_VALUE in values:
+            raise RuntimeError("bad image")
+        return [{"value": value} for value in values]
+
+
+def image(value: int, size: int = 64) -> np.ndarray:
+    return np.full((size, size), value, dtype=np.uint8)
+
+
+def run_queued(
+    batcher: OCRBatcher, engine: StubEngine, images: list[np.ndarray]
+) -> list[object]:
+    """Predict images[0] alone, then the rest as one queued batch"""
+    results: list[object] = [None] * len(images)
+
+    def predict(i: int) -> None:
+        try:
+            results[i] = batcher.predict(images[i])[0]
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=predict, args=(i,)) for i in range(len(images))]
+    threads[0].start()
+    assert engine.first_call.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while batcher._queue.qsize() < len(images) - 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    engine.release.set()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_queued_requests_share_predict_calls_by_size() -> None:
+    engine = StubEngine()
+    batcher = OCRBatcher(engine, max_batch_size=8, max_wait_time=0.05)
+    images = [image(0), image(1), image(2), image(3, size=256), image(4)]
+
+    results = run_queued(batcher, engine, images)
+
+    assert results == [{"value": i} for i in range(5)]
+    # First call alone, then the queued images split by size bucket
+    assert engine.calls[0] == 1
+    assert sorted(engine.calls[1:]) == [1, 3]
+
+
+def test_lone_request_does_not_wait() -> None:
+    engine = StubEngine()
+    engine.release.set()
+    batcher = OCRBatcher(engine, max_batch_size=8, max_wait_time=5)
+
+    start = time.monotonic()
+    assert batcher.predict(image(7)) == [{"value": 7}]
+    assert time.monotonic() - start < 1
+    assert engine.calls == [1]
+
+
+def test_failed_batch_falls_back_to_single_images() -> None:
+    engine = StubEngine(fail_batches=True)
+    batcher = OCRBatcher(engine, max_batch_size=8, max_wait_time=0.05)
+
+    results = run_queued(batcher, engine, [image(0), image(1), image(2), image(3)])
+
+    assert results == [{"value": i} for i in range(4)]
+    assert engine.calls == [1, 3, 1, 1, 1]
+
+
+def test_bad_image_fails_only_its_own_request() -> None:
+    engine = StubEngine()
+    batcher = OCRBatcher(engine, max_batch_size=8, max_wait_time=0.05)
+
+    results = run_queued(batcher, engine, [image(0), image(1), image(BAD_VALUE)])
+
+    assert results[:2] == [{"value": 0}, {"value": 1}]
+    assert isinstance(results[2], RuntimeError)
+
+
+def test_worker_survives_batch_exception() -> None:
+    engine = StubEngine()
+    engine.release.set()
+    batcher = OCRBatcher(engine, max_batch_size=8, max_wait_time=0.05)
+
+    # Not an image: size bucketing raises in the worker loop itself
+    with pytest.raises(AttributeError):
+        batcher.predict(None)  # type: ignore[arg-type]
+
+    assert batcher.predict(image(5)) == [{"value": 5}]
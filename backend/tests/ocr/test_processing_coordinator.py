@@ -0,0 +1,108 @@
+import threading
+from collections.abc import Iterable
+
+import numpy as np
+import pytest
+
+from app.ocr.engines.paddle.paddle_coordinator import OcrAttempt
+from app.ocr.pipeline import processing_coordinator
+from app.ocr.pipeline.processing_coordinator import (
+    MAX_BATCH_VARIANTS,
+    ProcessingCoordinator,
+)
+
+# Variant texts: the best one is neither the first nor the highest quality variant
+TEXTS = [
+    "KAVA 2,10\nSOK 3,00",
+    "konzum\nKAVA 2,10\nSOK 3,00\nUKUPNO 5,10",
+    "x",
+    "konzum d.d.\nRačun 12.03.2024 14:35\nKAVA 2,10\nSOK 3,00\nPDV 1,02\nUKUPNO 5,10",
+    "KAVA 2,10",
+    "konzum\nKAVA 2,10\nUKUPNO 2,10",
+]
+QUALITIES = [70.0, 60.0, 90.0, 55.0, 80.0, 65.0]
+
+
+@pytest.fixture
+def engines(monkeypatch: pytest.MonkeyPatch) -> dict[str, list[int]]:
+    """Stub OCR and quality scoring; records the thread of each image OCR'd per engine"""
+    used: dict[str, list[int]] = {"shared": [], "thread": []}
+
+    def ocr(images: list[np.ndarray], ocr_engine: str) -> list[list[OcrAttempt]]:
+        used[ocr_engine].extend([threading.get_ident()] * len(images))
+        return [
+            [OcrAttempt(TEXTS[int(image[0, 0])], 0, "default", int(image[0, 0]))]
+            for image in images
+        ]
+
+    def run_ocr_on_image(image: np.ndarray, **kwargs: object) -> list[OcrAttempt]:
+        return ocr([image], str(kwargs["ocr_engine"]))[0]
+
+    def run_ocr_batched(
+        images: list[np.ndarray], **kwargs: object
+    ) -> list[list[OcrAttempt]]:
+        return ocr(images, str(kwargs["ocr_engine"]))
+
+    monkeypatch.setattr(processing_coordinator, "RECEIPT_OCR_BACKEND", "paddle")
+    monkeypatch.setattr(processing_coordinator, "RECEIPT_OCR_USE_GPU", False)
+    monkeypatch.setattr(processing_coordinator, "get_ocr_engine", lambda **_: "shared")
+    monkeypatch.setattr(
+        processing_coordinator, "get_thread_ocr_engine", lambda **_: "thread"
+    )
+    monkeypatch.setattr(processing_coordinator, "run_ocr_on_image", run_ocr_on_image)
+    monkeypatch.setattr(processing_coordinator, "run_ocr_batched", run_ocr_batched)
+    monkeypatch.setattr(
+        processing_coordinator,
+        "score_image_quality_batch",
+        lambda images, _names: np.array([QUALITIES[int(i[0, 0])] for i in images]),
+    )
+    return used
+
+
+def variants(indices: Iterable[int]) -> list[np.ndarray]:
+    """Images whose pixel value selects their text and quality"""
+    return [np.full((8, 8), i, dtype=np.uint8) for i in indices]
+
+
+# 19.0 stops at variant 1, one rank before the best text (variant 3)
+@pytest.mark.parametrize("early_exit_score", [None, 19.0])
+def test_parallel_variants_pick_the_sequential_winner(
+    engines: dict[str, list[int]], early_exit_score: float | None
+) -> None:
+    images = variants(range(len(TEXTS)))
+    # Enough variants after the top-ranked one to use the worker pool
+    assert len(images) > MAX_BATCH_VARIANTS + 1
+
+    sequential = ProcessingCoordinator(max_workers=1, early_exit_score=early_exit_score)
+    expected = sequential.run_paddleocr_processing(images)
+    assert not engines["thread"]
+
+    parallel = ProcessingCoordinator(max_workers=4, early_exit_score=early_exit_score)
+    assert parallel.run_paddleocr_processing(images) == expected
+    assert engines["thread"] and threading.get_ident() not in engines["thread"]
+
+
+def test_few_variants_do_not_start_the_pool(engines: dict[str, list[int]]) -> None:
+    coordinator = ProcessingCoordinator(max_workers=4, early_exit_score=None)
+
+    coordinator.run_paddleocr_processing(variants(range(MAX_BATCH_VARIANTS + 1)))
+
+    assert coordinator._pool is None
+    assert not engines["thread"]
+    assert len(engines["shared"]) == MAX_BATCH_VARIANTS + 1
+
+
+def test_early_exit_on_top_variant_skips_the_rest(
+    engines: dict[str, list[int]],
+) -> None:
+    # Variant 0 ranks first (quality 70) and scores 1.4
+    images = variants([5, 0, 1])
+
+    exhaustive = ProcessingCoordinator(max_workers=4, early_exit_score=None)
+    assert exhaustive.run_paddleocr_processing(images)[0] == TEXTS[1]
+    assert len(engines["shared"]) == 3
+
+    engines["shared"].clear()
+    early = ProcessingCoordinator(max_workers=4, early_exit_score=1.0)
+    assert early.run_paddleocr_processing(images)[0] == TEXTS[0]
+    assert len(engines["shared"]) == 1
@@ -0,0 +1,34 @@
+import random
+
+from app.ocr.engines.scoring.text_scoring import max_text_score, score_ocr_text
+
+RECEIPT_TOKENS = [
+    "KAVA", "2,10", "1", "UKUPNO", "Račun", "konzum", "12.03.2024", "14:35",
+    "-----", "====", "PDV", "porez", "blagajna", "kasa", "operater", "datum",
+    "vrijeme", "suma", "bon", "caffe", "Mlijeko", "0.99", "ab", "x",
+]
+
+
+def test_max_text_score_bounds_dense_price_lines() -> None:
+    # Shortest lines that earn the line and price points, plus every bonus
+    header = "caffe ukupno suma račun bon datum vrijeme pdv porez blagajna kasa operater"
+    extras = "12.03.2024 14:35 ---- receipt receipt receipt receipt receipt"
+    for count in range(0, 200, 7):
+        text = "\n".join([header, extras, *["1,00"] * count])
+        assert score_ocr_text(text) <= max_text_score(len(text))
+
+
+def test_max_text_score_bounds_random_texts() -> None:
+    rng = random.Random(0)
+    for _ in range(2000):
+        lines = [
+            " ".join(rng.choice(RECEIPT_TOKENS) for _ in range(rng.randint(0, 6)))
+            for _ in range(rng.randint(0, 40))
+        ]
+        text = "\n".join(lines)
+        assert score_ocr_text(text) <= max_text_score(len(text))
+
+
+def test_max_text_score_short_text_is_zero() -> None:
+    assert max_text_score(4) == 0
+    assert score_ocr_text("1,00") == 0